@@ -6,17 +6,28 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.action_chains import ActionChains
-import time, json, re
+import time, re
+from collections import deque
 from pathlib import Path
 
+from sink import JsonlSink, export_json, row_ids
+from seen_index import SeenIndex, scope_key, scope_id
+from waits import wait_idle, wait_listbox
+from grid import read_rows, row_key, cell_for
+from scroller import GridScroller
+from detail_fetch import enable_network_log, drain_network_log, calibrate, TabFetcher
+from lean import lean_options, apply_lean, page_stats
+from tracing import Tracer
+from judgment_store import JudgmentStore
+from session import CookieJar, attach, attach_address, on_form
+from supervisor import Supervisor, Recycle, browser_service
+from dataset import export_dataset
+
 # ======= CONFIG =======
 URL = "https://grpportal.rak.ae/irj/portal/judgement_publications"
 DATA_DIR = Path("Data")
 DATA_DIR.mkdir(exist_ok=True)
 
-TABLE_SEL = (By.CSS_SELECTOR, "table[ct='ST']")
 BACK_BTN_XP = "//div[@role='button' and @title='عودة']"
 SEL = {
     "court": 'input[data-hint*="ZDE_COURT_TYPE"]',
@@ -34,20 +45,46 @@ def norm(txt):
     txt = txt.replace("\u200e", "").replace("\u200f", "").translate(DIGIT_MAP)
     return re.sub(r"\s+", " ", txt).strip()
 
-def create_driver():
+class RateLimiter:
+    """Politeness delay: at most `per_min` calls to `wait()` per minute."""
+    def __init__(self, per_min=None):
+        self.interval = 60.0 / per_min if per_min else 0.0
+        self.last = 0.0
+
+    def wait(self):
+        if not self.interval: return
+        delay = self.last + self.interval - time.time()
+        if delay > 0: time.sleep(delay)
+        self.last = time.time()
+
+def create_driver(perf_log=False, lean=False, debugger=None):
+    debugger = debugger or attach_address()
+    if debugger:
+        print(f"🔗 Attaching to warm browser at {debugger}...")
+        driver = attach(debugger, URL, perf_log=perf_log)
+        if lean: apply_lean(driver)
+        return driver
     print("🔧 Launching browser...")
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
-    return webdriver.Chrome(options=options)
+    if perf_log: enable_network_log(options)
+    if lean: lean_options(options)
+    driver = webdriver.Chrome(options=options, service=browser_service())
+    if lean: apply_lean(driver)
+    n = CookieJar().load(driver)
+    if n: print(f"🍪 Reusing {n} saved session cookies")
+    return driver
+
+def judged_on(row_data):
+    """Judgment date of a grid row ("24.03.2021") as ISO "2021-03-24", or None."""
+    m = re.fullmatch(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", norm(row_data[4])) if len(row_data) > 4 else None
+    return f"{m[3]}-{int(m[2]):02d}-{int(m[1]):02d}" if m else None
 
 def wait_until_invisible(driver, sel):
-    try:
-        WebDriverWait(driver, 20).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, sel)))
-    except TimeoutException:
-        pass
+    return wait_idle(driver, 20, sel)   # False on timeout; the next step fails loudly if still busy
 
 def set_combo(driver, css, value):
     if not value: return
@@ -55,11 +92,12 @@ def set_combo(driver, css, value):
     wait_until_invisible(driver, SEL["busy"])
     box = driver.find_element(By.CSS_SELECTOR, css)
     driver.execute_script("arguments[0].removeAttribute('readonly')", box)
-    box.click(); time.sleep(0.5)
-    box.send_keys(Keys.ARROW_DOWN)
+    box.click()
+    if not wait_listbox(driver, 0.5):
+        box.send_keys(Keys.ARROW_DOWN)
 
     print(f"🔍 Matching dropdown for: {value}")
-    time.sleep(1)
+    wait_listbox(driver, 5)
     options = driver.find_elements(By.XPATH, "//div[@ct='LIB_I']")
     for i, opt in enumerate(options):
         print(f"  [{i+1}] {opt.text.strip()}")
@@ -69,104 +107,233 @@ def set_combo(driver, css, value):
     ).click()
     print(f"✅ Selected: {value}")
 
-def rows_in_view(driver):
-    tbl = driver.find_elements(*TABLE_SEL)
-    return tbl[0].find_elements(By.CSS_SELECTOR, "tbody tr[role='row']")[1:] if tbl else []
+def scrape_all_rows(driver, sink, seen, limiter=None, fetch_mode=False, incremental=False, tracer=None,
+                    supervisor=None):
+    print("🚀 Starting scraping loop...")
+    tried = set()
+    tr = tracer or Tracer()
+    sup = supervisor or Supervisor(every=0, hang_timeout=None)
+    # incremental: rows judged before the scope's high-water mark are skipped;
+    # the mark only advances after a crawl that reached the end of the grid
+    mark = seen.high_water() if incremental else None
+    if mark: print(f"⏩ Incremental – skipping rows judged before {mark}")
+    newest = failed = prev_d = descending = None
+    complete = False
+    limiter = limiter or RateLimiter()
+    # fetch mode: after one calibration click, details are fetched over HTTP
+    # (fetch_mode=True) or in a few extra tabs of this browser (fetch_mode="tabs")
+    fetcher, calib_left, pending = None, 3 if fetch_mode else 0, deque()
+
+    def drain(block):
+        # write fetched details in grid order, as soon as the head is ready
+        while pending and (block or pending[0][2].done()):
+            row_data, rid, fut = pending.popleft()
+            try:
+                with tr.span("fetch_wait"): text = fut.result()
+                with tr.span("write"): sink.append(row_data, text)
+                seen.add(rid)
+                done(row_data, True)
+                sup.row_done()
+                print(f"✅ Row {sink.count} fetched")
+            except Exception as e:
+                done(row_data, False)
+                tr.count("fetch_errors")
+                print(f"⚠️  Fetch error: {e}")
 
-def last_row_id(row_el):
-    return "|".join(c.text.strip() for c in row_el.find_elements(By.TAG_NAME, "td"))
+    def done(row_data, ok):
+        nonlocal newest, failed
+        d = judged_on(row_data)
+        if ok: tr.count("rows")
+        if not d: return
+        if ok: newest = max(newest or d, d)
+        else: failed = min(failed or d, d)
 
-def wait_new_rows(driver, prev_last_id, timeout=4):
-    end = time.time() + timeout
-    while time.time() < end:
-        cur = last_row_id(rows_in_view(driver)[-1])
-        if cur != prev_last_id:
-            return cur
-        time.sleep(0.25)
-    return cur
+    WebDriverWait(driver, 30).until(lambda _: read_rows(driver))
+
+    scroller = GridScroller(driver, tr, beat=sup.beat)
+    try:
+        while True:
+            vis = read_rows(driver)
+            # stale page (e.g. a failed back click): never mistake it for the end
+            if not vis: raise Recycle("no grid rows visible")
+            print(f"📄 Page {scroller.rounds} – {len(vis)} rows")
+            sup.beat()
+            for row_data in vis:
+                sup.check(driver)           # Recycle: run_scraper resumes in a fresh browser
+                try:
+                    if len(row_data) < 7: continue
+                    rid = row_key(row_data)
+                    if not rid or rid in tried: continue
+                    d = judged_on(row_data)
+                    # newest-first only once a date strictly drops, and never after it rises
+                    if d and prev_d and d > prev_d: descending = False
+                    elif d and prev_d and d < prev_d and descending is None: descending = True
+                    prev_d = d or prev_d
+                    if mark and d and d < mark: tried.add(rid); continue
+                    if rid in seen: continue
+                    if fetcher:
+                        tried.add(rid)
+                        limiter.wait()
+                        pending.append((row_data, rid, fetcher.submit(row_data)))
+                        drain(False)
+                        continue
+                    cell = cell_for(driver, rid, 6)
+                    if cell is None:            # grid re-rendered; kept below the mark so it is retried
+                        tr.count("rerender"); done(row_data, False); continue
+                    tried.add(rid)
+                    limiter.wait()
+                    if calib_left: drain_network_log(driver)
+                    with tr.span("detail", row=rid):
+                        driver.execute_script("arguments[0].scrollIntoView({block:'center'})", cell)
+                        cell.click()
+                        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, BACK_BTN_XP)))
+                        detail = driver.find_element(By.TAG_NAME, "body").text
+                    with tr.span("write"): sink.append(row_data, detail)
+                    seen.add(rid)
+                    done(row_data, True)
+                    sup.row_done()
+                    print(f"✅ Row {sink.count} scraped")
+                    if calib_left:
+                        calib_left -= 1
+                        tabs = fetch_mode == "tabs"     # three extra tabs; HTTP keeps the default pool
+                        fetcher = calibrate(driver, row_data, detail, norm, workers=3 if tabs else 4,
+                                            fetcher_cls=TabFetcher if tabs else None)
+                        if fetcher: calib_left = 0; print(f"⚡ Direct detail fetch enabled ({type(fetcher).__name__})")
+                        elif not calib_left: print("↩ Direct detail fetch unavailable – clicking")
+                    with tr.span("back"):
+                        driver.find_element(By.XPATH, BACK_BTN_XP).click()
+                        WebDriverWait(driver, 20).until(lambda _: read_rows(driver))
+                except Exception as e:
+                    print(f"⚠️  Row error: {e}")
+                    done(row_data, False)
+                    tr.count("row_errors")
+                    sup.on_error(driver)
+                    try: driver.find_element(By.XPATH, BACK_BTN_XP).click()
+                    except: pass
+                    continue
+
+            # newest-first grid already below the mark: nothing newer further down
+            last_d = judged_on(vis[-1]) if vis else None
+            if mark and descending is True and last_d and last_d < mark:
+                print("⏹  Reached rows older than the high-water mark")
+                complete = True
+                break
 
-def scrape_all_rows(driver, out_path):
-    print("🚀 Starting scraping loop...")
-    results, seen = [], set()
-    WebDriverWait(driver, 30).until(lambda _: len(rows_in_view(driver)) > 0)
-
-    round, stagnant = 0, 0
-    while round < 100:
-        vis = rows_in_view(driver)
-        print(f"📄 Page {round} – {len(vis)} rows")
-        for idx in range(len(vis)):
             try:
-                vis = rows_in_view(driver)
-                row = vis[idx]
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) < 7: continue
-                row_data = [c.text.strip() for c in cells]
-                rid = "|".join(row_data)
-                if not rid or rid in seen: continue
-                seen.add(rid)
-                driver.execute_script("arguments[0].scrollIntoView({block:'center'})", cells[6])
-                cells[6].click()
-                WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, BACK_BTN_XP)))
-                detail = driver.find_element(By.TAG_NAME, "body").text
-                results.append({"index": len(results), "row_data": row_data, "detail_text": detail})
-                out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
-                print(f"✅ Row {len(results)} scraped")
-                driver.find_element(By.XPATH, BACK_BTN_XP).click()
-                WebDriverWait(driver, 20).until(lambda _: len(rows_in_view(driver)) > 0)
+                if not scroller.advance():
+                    complete = scroller.finished()
+                    if not complete: raise Recycle("grid stopped before its last row")
+                    break
+            except Recycle:
+                raise
             except Exception as e:
-                print(f"⚠️  Row error: {e}")
-                try: driver.find_element(By.XPATH, BACK_BTN_XP).click()
-                except: pass
-                continue
-
-        try:
-            vis = rows_in_view(driver)
-            bottom_before = last_row_id(vis[-1])
-            driver.execute_script("arguments[0].scrollIntoView()", vis[-2])
-            ActionChains(driver).send_keys(Keys.ARROW_DOWN * 11).perform()
-            bottom_after = wait_new_rows(driver, bottom_before)
-        except Exception as e:
-            print(f"⚠️  Scroll error: {e}")
-            break
-
-        stagnant = stagnant + 1 if bottom_after == bottom_before else 0
-        if stagnant >= 2: break
-        round += 1
-
-    print(f"🎉 Done. {len(results)} total rows.")
-    return len(results)
+                raise Recycle(f"scroll error: {e}") from e
+    finally:
+        drain(True)
+        if fetcher: fetcher.close()
+
+    if complete and newest:
+        # a failed row stays at/above the mark so the next refresh retries it
+        seen.set_high_water(min(newest, failed) if failed else newest)
+    print(f"🎉 Done. {sink.count} total rows.")
+    return sink.count
 
 # ======= ENTRY POINT =======
-def run_scraper(court, year, clas=None, ctype=None, num=None, file_prefix="result"):
-    fname = f"{file_prefix}_{int(time.time())}.json"
-    out_path = DATA_DIR / fname
-    driver = create_driver()
-    try:
+def open_search(driver, tr, sup, court, year, clas=None, ctype=None, num=None):
+    """Load the portal, set the filters and run the search (again after every restart)."""
+    # a warm daemon tab already sits on an unused search form
+    if on_form(driver, SEL["court"]) and not driver.find_elements(By.CSS_SELECTOR, "table[ct='ST']"):
+        print("🌐 Portal already open")
+    else:
         print("🌐 Opening portal...")
         driver.get(URL)
-        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CSS_SELECTOR, SEL["court"])))
+    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.CSS_SELECTOR, SEL["court"])))
+    st = page_stats(driver)
+    print(f"📦 Portal loaded: {st['bytes'] / 1024:.0f} KiB in {st['requests']} requests, {st['load_ms']:.0f} ms")
+
+    for field, value in (("court", court), ("clas", clas), ("ctype", ctype), ("year", year)):
+        if not value: continue
+        sup.beat()
+        with tr.span("set_combo", field=field): set_combo(driver, SEL[field], value)
 
-        set_combo(driver, SEL["court"], court)
-        if clas: set_combo(driver, SEL["clas"], clas)
-        if ctype: set_combo(driver, SEL["ctype"], ctype)
-        set_combo(driver, SEL["year"], year)
+    if num:
+        box = driver.find_element(By.CSS_SELECTOR, SEL["num"])
+        box.clear()
+        box.send_keys(num)
 
-        if num:
-            box = driver.find_element(By.CSS_SELECTOR, SEL["num"])
-            box.clear()
-            box.send_keys(num)
+    driver.find_element(By.CSS_SELECTOR, SEL["search"]).click()
+    with tr.span("idle"): wait_until_invisible(driver, SEL["busy"])
 
-        driver.find_element(By.CSS_SELECTOR, SEL["search"]).click()
-        wait_until_invisible(driver, SEL["busy"])
+def search_scope(court, year, clas=None, ctype=None, num=None):
+    return scope_key(*(norm(v) if v else "" for v in (court, clas, ctype, year, num)))
 
-        rows = scrape_all_rows(driver, out_path)
-        print(f"✅ Saved to {out_path.resolve()} – {rows} rows")
+def jsonl_path_for(scope, file_prefix="result"):
+    return DATA_DIR / f"{file_prefix}_{scope_id(scope)}.jsonl"
+
+def run_scraper(court, year, clas=None, ctype=None, num=None, file_prefix="result",
+                resume=True, max_per_min=None, export=True, fetch_mode=False, incremental=False,
+                lean=False, store=False, recycle_rows=2000, max_rss_mb=None, hang_timeout=180,
+                dataset=False):
+    fname = f"{file_prefix}_{int(time.time())}.json"
+    out_path = DATA_DIR / fname
+    scope = search_scope(court, year, clas, ctype, num)
+    seen = SeenIndex(scope)
+    jsonl_path = jsonl_path_for(scope, file_prefix)
+    if incremental: resume = True
+    if resume and jsonl_path.exists():
+        seen.update(row_ids(jsonl_path))
+        print(f"↻ Resuming – {len(seen)} rows already scraped")
+    else:
+        seen.clear()
+    sink = JsonlSink(jsonl_path, resume=resume, on_flush=seen.commit)
+    tr = Tracer(DATA_DIR / "traces" / f"{out_path.stem}_{scope_id(scope)}.jsonl")
+    sup = Supervisor(every=recycle_rows, max_rss_mb=max_rss_mb, hang_timeout=hang_timeout)
+    limiter = RateLimiter(max_per_min)
+    try:
+        # one browser per session; after a Recycle the filters are set again and
+        # the seen index skips every row a previous session already saved
+        while True:
+            driver = create_driver(perf_log=bool(fetch_mode), lean=lean)
+            sup.attach(driver)
+            before = sink.count
+            try:
+                open_search(driver, tr, sup, court, year, clas, ctype, num)
+                rows = scrape_all_rows(driver, sink, seen, limiter, fetch_mode, incremental, tr, sup)
+                print(f"✅ Scraped {rows} rows")
+                CookieJar().save(driver)
+                break
+            except Exception as e:
+                if not (isinstance(e, Recycle) or sup.hung): raise
+                tr.count("restarts")
+                if not sup.restart(e, sink.count > before):
+                    print("❌ No progress after repeated restarts – giving up")
+                    break
+            finally:
+                sup.detach()
+                try: driver.quit()
+                except Exception: pass
 
     except Exception as e:
         print(f"❌ Failed: {e}")
     finally:
-        driver.quit()
+        sup.close()
+        sink.close()
+        seen.close()
+        print(tr.summary())
+        tr.write_prometheus(tr.path.with_suffix(".prom"))
+        tr.close()
+        if export:
+            rows = export_json(sink.path, out_path)
+            print(f"💾 Saved to {out_path.resolve()} – {rows} rows")
+        if dataset:
+            try: print(f"📊 {export_dataset([sink.path])} rows written to the Parquet dataset")
+            except RuntimeError as e: print(f"⚠️  {e}")
+        if store:  # after the exports, so a store failure never costs the JSON output
+            try:
+                with JudgmentStore() as st: print(f"🗜  {st.ingest([sink.path])} new judgments archived")
+            except Exception as e: print(f"⚠️  Judgment store: {e}")
         print("🧹 Done.")
+    return out_path if export else sink.path
 
 # ======= RUN IT =======
 if __name__ == "__main__":
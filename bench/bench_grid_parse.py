@@ -0,0 +1,81 @@
+"""Benchmark: grid parsing, old BeautifulSoup path vs grid_parse.
+
+    python bench/bench_grid_parse.py [snapshot.html | dir ...] [--rows 500] [--repeat 5]
+
+Snapshots are saved portal pages (`drv.page_source` from the grid frame).
+With no snapshots, a synthetic SAP-style page with `--rows` rows is used.
+Reports the median wall time and tracemalloc peak per parser.
+"""
+from __future__ import annotations
+import argparse, statistics, sys, time, tracemalloc, unicodedata
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from grid_parse import parse_grid_html
+
+
+# ── the previous rak_scrape.pick_table, verbatim ───────────────
+def has_arabic(s): return any("ARABIC" in unicodedata.name(ch,"") for ch in s)
+
+def legacy_pick_table(html)->pd.DataFrame|None:
+    soup=BeautifulSoup(html,"lxml")
+    hdr_tbl=soup.select_one(
+        "table:has(td:contains('رقم القضية'), th:contains('رقم القضية'))")
+    if hdr_tbl:
+        return pd.read_html(StringIO(str(hdr_tbl)),flavor="lxml")[0]
+    for tbl in soup.select("table"):
+        hdr=" ".join(td.get_text() for td in tbl.find("tr").find_all(["td","th"]))
+        if has_arabic(hdr) and len(tbl.find_all("tr"))>=3:
+            return pd.read_html(StringIO(str(tbl)),flavor="lxml")[0]
+    return None
+
+
+def synthetic_page(n_rows: int) -> str:
+    hdr = ["", "رقم القضية", "المحكمة", "تاريخ القيد", "تاريخ الحكم", "رقم الوثيقة", ""]
+    row = lambda i: ["", f"{i} / 2024  مدني كلي", "الإبتدائية", "10.01.2024",
+                     "24.03.2024", str(1000 + i), "نص الحكم"]
+    tr = lambda cells: "<tr role='row'>" + "".join(f"<td><span>{c}</span></td>" for c in cells) + "</tr>"
+    chrome = "".join(f"<div class='lsField'><input data-hint='X{i}'/></div>" for i in range(300))
+    return (f"<html><body>{chrome}<table ct='ST'><tbody>{tr(hdr)}"
+            + "".join(tr(row(i)) for i in range(n_rows)) + "</tbody></table></body></html>")
+
+
+def measure(fn, html, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(html); times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    df = fn(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak, 0 if df is None else len(df)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("snapshots", nargs="*")
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=5)
+    a = ap.parse_args()
+
+    pages = []
+    for p in map(Path, a.snapshots):
+        files = sorted(p.glob("*.html")) if p.is_dir() else [p]
+        pages += [(f.name, f.read_text(encoding="utf-8")) for f in files]
+    if not pages:
+        pages = [(f"synthetic-{a.rows}", synthetic_page(a.rows))]
+
+    print(f"{'page':<28}{'parser':<12}{'median ms':>10}{'peak KiB':>10}{'rows':>6}")
+    for name, html in pages:
+        for label, fn in (("legacy", legacy_pick_table), ("lxml", parse_grid_html)):
+            t, peak, n = measure(fn, html, a.repeat)
+            print(f"{name[:27]:<28}{label:<12}{t * 1e3:>10.1f}{peak / 1024:>10.0f}{n:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: portal page weight with and without the lean profile.
+
+    python bench/bench_lean.py [--url URL] [--repeat 3] [--css]
+
+Each mode gets a fresh headless Chrome, which loads the portal `--repeat`
+times with the cache disabled. Reports the median transferred bytes,
+request count and load time, plus the browser's total RSS when psutil is
+installed.
+"""
+from __future__ import annotations
+import argparse, statistics, sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+import app
+from lean import apply_lean, page_stats
+from supervisor import chrome_rss
+
+def run(url, lean, css, repeat):
+    driver = app.create_driver(lean=lean)
+    if lean and css: apply_lean(driver, css=True)
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    stats = []
+    try:
+        for _ in range(repeat):
+            driver.get(url)
+            WebDriverWait(driver, 60).until(EC.presence_of_element_located((By.CSS_SELECTOR, app.SEL["court"])))
+            stats.append(page_stats(driver))
+        rss = chrome_rss(driver)
+    finally:
+        driver.quit()
+    med = lambda k: statistics.median(s[k] for s in stats)
+    return med("bytes"), med("requests"), med("load_ms"), rss
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", default=app.URL)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--css", action="store_true", help="also block stylesheets in lean mode")
+    a = ap.parse_args()
+
+    print(f"{'mode':<8}{'KiB':>10}{'requests':>10}{'load ms':>10}{'RSS MiB':>10}")
+    for label, lean in (("full", False), ("lean", True)):
+        b, n, ms, rss = run(a.url, lean, a.css, a.repeat)
+        print(f"{label:<8}{b / 1024:>10.0f}{n:>10.0f}{ms:>10.0f}{'-' if rss is None else f'{rss / 2**20:.0f}':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark the scraper loops against the local fake portal.
+
+    python bench/bench_scrapers.py [--targets app main do_search] [--rows 120] [--latency 0.05]
+
+Starts `bench/fake_portal.py` in-process and runs each target once in a
+scratch working directory, so `Data/` state (seen index, caches, frame
+paths) never touches the real one:
+
+* app       `app.run_scraper` on `/wd`
+* app_tabs  the same with `fetch_mode="tabs"`
+* main      `main.scrape` on `/wd?auto=1` (headless, no login prompt)
+* do_search `rak_scrape.do_search` on `/portal` (one pooled driver)
+
+Reports rows/sec, WebDriver commands per row (every call through
+`WebDriver.execute`), the Python tracemalloc peak and, with psutil
+installed, the peak RSS of the browser processes.
+"""
+from __future__ import annotations
+import argparse, os, sys, tempfile, threading, time, tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT)); sys.path.insert(0, str(ROOT / "bench"))
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from fake_portal import serve, OPTIONS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+COURT, CLAS, YEAR = OPTIONS["court"][0], OPTIONS["clas"][0], OPTIONS["year"][-1]
+
+
+class CallCounter:
+    """Counts WebDriver commands by wrapping `WebDriver.execute`."""
+    def __init__(self):
+        self.n, self._orig = 0, WebDriver.execute
+        counter = self
+        def execute(drv, *a, **kw):
+            counter.n += 1
+            return counter._orig(drv, *a, **kw)
+        WebDriver.execute = execute
+
+
+class RssSampler:
+    """Peak summed RSS of this process's child processes (chromedriver + Chrome)."""
+    def __init__(self, every=0.25):
+        self.peak, self.every, self._stop = 0, every, threading.Event()
+        if psutil: threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        me = psutil.Process()
+        while not self._stop.wait(self.every):
+            try: rss = sum(p.memory_info().rss for p in me.children(recursive=True))
+            except psutil.Error: continue
+            self.peak = max(self.peak, rss)
+
+    def stop(self):
+        self._stop.set()
+        return self.peak if psutil else None
+
+
+def run_app(base, **kw):
+    import app
+    from sink import iter_jsonl
+    app.URL = base + "/wd"
+    path = app.run_scraper(court=COURT, year=YEAR, clas=CLAS, resume=False, export=False, **kw)
+    return sum(1 for _ in iter_jsonl(path))
+
+
+def run_app_tabs(base):
+    return run_app(base, fetch_mode="tabs")
+
+
+def run_main(base):
+    import main
+    from sink import iter_jsonl
+    out = main.scrape("bench", fresh=True, url=base + f"/wd?auto=1&clas={CLAS}",
+                      headless=True, wait_for_login=False)
+    return sum(1 for _ in iter_jsonl(out.with_suffix(".jsonl")))
+
+
+def run_do_search(base):
+    os.environ.update(RAK_URL=base + "/portal", RAK_POOL_SIZE="1")
+    import rak_scrape                   # loads the option lists through the pool
+    for df, msg, *_ in rak_scrape.do_search(COURT, CLAS, None, YEAR, "", force=True):
+        print(msg)
+    return 0 if df is None else len(df)
+
+
+TARGETS = {"app": run_app, "app_tabs": run_app_tabs, "main": run_main, "do_search": run_do_search}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    ap.add_argument("--rows", type=int, default=120)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--page", type=int, default=15)
+    a = ap.parse_args()
+
+    srv, base, portal = serve(rows=a.rows, latency=a.latency, page=a.page)
+    os.chdir(tempfile.mkdtemp(prefix="rak-bench-"))
+    calls = CallCounter()
+    results = []
+    for name in a.targets:
+        print(f"── {name} ──")
+        n0, h0 = calls.n, portal.hits
+        rss = RssSampler()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        try:
+            rows = TARGETS[name](base)
+        except ImportError as e:
+            print(f"skipped: {e}")
+            tracemalloc.stop(); rss.stop(); continue
+        dt = time.perf_counter() - t0
+        py_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append((name, rows, dt, calls.n - n0, portal.hits - h0, py_peak, rss.stop()))
+    srv.shutdown()
+
+    print(f"\n{a.rows} rows, {a.latency * 1e3:.0f} ms latency, page {a.page}")
+    print(f"{'target':<11}{'rows':>6}{'secs':>8}{'rows/s':>8}{'wd calls':>10}{'/row':>7}"
+          f"{'server':>8}{'py MiB':>8}{'chrome MiB':>12}")
+    for name, rows, dt, n, hits, py, ch in results:
+        per = n / rows if rows else float("nan")
+        print(f"{name:<11}{rows:>6}{dt:>8.1f}{rows / dt:>8.2f}{n:>10}{per:>7.1f}{hits:>8}"
+              f"{py / 2**20:>8.1f}{'-' if ch is None else f'{ch / 2**20:.0f}':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: JSON outputs vs judgment_store for disk usage and lookups.
+
+    python bench/bench_store.py Data/*.json [--lookups 200]
+
+Ingests the given scraper outputs into a scratch store and compares total
+size on disk, plus the time to read random judgments by case number:
+loading and scanning the JSON file vs one indexed read from the pack.
+"""
+from __future__ import annotations
+import argparse, random, statistics, sys, tempfile, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from judgment_store import JudgmentStore
+from sink import iter_records
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("paths", nargs="+")
+    ap.add_argument("--lookups", type=int, default=200)
+    a = ap.parse_args()
+    paths = [Path(p) for p in a.paths]
+    src_bytes = sum(p.stat().st_size for p in paths)
+
+    root = Path(tempfile.mkdtemp(prefix="rak-store-"))
+    t0 = time.perf_counter()
+    with JudgmentStore(root) as st:
+        st.ingest(paths)
+        ingest_s = time.perf_counter() - t0
+        s = st.stats()
+    store_bytes = sum(f.stat().st_size for f in root.iterdir())
+
+    by_file = [(p, rec["row_data"][1]) for p in paths for rec in iter_records(p) if len(rec["row_data"]) > 1]
+    sample = random.sample(by_file, min(a.lookups, len(by_file)))
+    json_t, store_t = [], []
+    with JudgmentStore(root) as st:
+        for p, case in sample:
+            t = time.perf_counter()
+            next(r for r in iter_records(p) if r["row_data"][1] == case)
+            json_t.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            st.get(case)
+            store_t.append(time.perf_counter() - t)
+
+    print(f"{s['rows']} rows, {s['bodies']} unique bodies, codec {'/'.join(s['codecs'])}, ingest {ingest_s:.1f}s")
+    print(f"disk   json {src_bytes / 2**20:8.2f} MiB   store {store_bytes / 2**20:8.2f} MiB"
+          f"   ({src_bytes / max(store_bytes, 1):.1f}× smaller)")
+    print(f"lookup json {statistics.median(json_t) * 1e3:8.2f} ms    store {statistics.median(store_t) * 1e3:8.3f} ms"
+          f"   (median of {len(sample)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Offline check of detail_fetch's request capture, templating and calibration.
+
+    python bench/check_detail_fetch.py
+
+Serves a stub detail endpoint on localhost and feeds `capture_request` /
+`calibrate` a fake driver whose performance log holds the "clicked"
+request. No browser needed. Checks that:
+
+* a value is replaced only as a whole token: doc "14" is substituted,
+  but the "14" inside "2014" is not;
+* the quoted (URL path/query) and plus-encoded (form body) forms of a
+  case number are both found and re-rendered for another row;
+* `calibrate` keeps a template that returns the clicked judgment and
+  rejects one whose replay returns a different page;
+* a fetcher whose cookies went stale re-syncs them from the browser on
+  a 403 and retries instead of failing the row.
+"""
+from __future__ import annotations
+import json, sys, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, quote_plus, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detail_fetch import capture_request, calibrate, html_to_text
+
+ROWS = {
+    "14": ["", "8 / 2014  مدني كلي", "الإبتدائية", "10.01.2014", "24.03.2015", "14", "نص الحكم"],
+    "805": ["", "277 / 2019  مدني جزئي", "الإبتدائية", "30.12.2019", "12.01.2020", "805", "نص الحكم"],
+}
+
+
+def page(row):
+    return (f"<html><body><h3>نص الحكم</h3><p>في الدعوى رقم {row[1]}</p><p>رقم الوثيقة: {row[5]}</p>"
+            f"<p>{'حيث إن المحكمة قد اطلعت على الأوراق رقم ' + row[5] + ' . ' * 4}</p></body></html>")
+
+
+class Stub(BaseHTTPRequestHandler):
+    broken = False                      # True: ignore the doc id (replay returns the wrong judgment)
+
+    def log_message(self, *a): pass
+
+    def answer(self, doc):
+        if "SAP_SESSIONID=ok" not in (self.headers.get("Cookie") or ""):
+            self.send_response(403); self.end_headers(); return
+        row = ROWS["805" if Stub.broken else doc]
+        data = page(row).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.answer(parse_qs(urlsplit(self.path).query)["doc"][0])
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        case = parse_qs(body)["case"][0]
+        self.answer(next(d for d, r in ROWS.items() if r[1] == case))
+
+
+class FakeDriver:
+    """Just enough WebDriver for capture_request / DetailFetcher."""
+    def __init__(self, *requests_sent):
+        self.log = [{"message": json.dumps({"message": {
+            "method": "Network.requestWillBeSent",
+            "params": {"type": "Document", "request": r}}})} for r in requests_sent]
+
+    def get_log(self, kind): return self.log
+    def execute_script(self, js, *a): return "stub-agent"
+    def get_cookies(self): return [{"name": "SAP_SESSIONID", "value": "ok", "domain": "127.0.0.1", "path": "/"}]
+
+
+def main():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    r14, r805 = ROWS["14"], ROWS["805"]
+
+    # whole-token substitution: "14" in doc=14 changes, the 14 of yr=2014 does not
+    drv = FakeDriver({"method": "GET", "url": f"{base}/detail?yr=2014&doc=14&p=x14", "headers": {}})
+    tpl = capture_request(drv, r14)
+    assert tpl and tpl.col == 5 and tpl.value == "14", tpl
+    url, _ = tpl.render(r805)
+    assert url == f"{base}/detail?yr=2014&doc=805&p=x14", url
+    print("✓ token-boundary substitution")
+
+    # encoded forms: case number quoted in the URL and plus-encoded in the form body
+    case14, case805 = r14[1], r805[1]
+    drv = FakeDriver({"method": "POST", "url": f"{base}/detail/{quote(case14)}",
+                      "headers": {"Content-Type": "application/x-www-form-urlencoded"},
+                      "postData": f"case={quote_plus(case14)}&yr=2014"})
+    tpl = capture_request(drv, ["", case14, "", "", "", "", ""])
+    assert tpl and tpl.col == 1, tpl
+    url, body = tpl.render(["", case805, "", "", "", "", ""])
+    assert url == f"{base}/detail/{quote(case805)}", url
+    assert body == f"case={quote_plus(case805)}&yr=2014", body
+    print("✓ quoted and plus-encoded values")
+
+    # calibration: accepted when the replay returns the clicked judgment ...
+    drv = FakeDriver({"method": "GET", "url": f"{base}/detail?doc=14", "headers": {}})
+    clicked = html_to_text(page(r14))
+    fetcher = calibrate(drv, r14, clicked)
+    assert fetcher is not None, "calibration should accept a faithful replay"
+    assert "277 / 2019" in fetcher.fetch(r805)
+    # the copied session cookie goes stale: a 403 re-syncs from the browser and retries
+    fetcher.session.cookies.set("SAP_SESSIONID", "expired", domain="127.0.0.1", path="/")
+    assert "277 / 2019" in fetcher.submit(r805).result()
+    fetcher.close()
+    # ... and rejected when it returns another one
+    Stub.broken = True
+    assert calibrate(drv, r14, clicked) is None, "calibration should reject a wrong replay"
+    Stub.broken = False
+    # ... or when nothing in the captured request matches the row
+    assert calibrate(FakeDriver({"method": "GET", "url": f"{base}/detail?doc=99", "headers": {}}),
+                     r14, clicked) is None
+    print("✓ calibration accept / reject, cookie re-sync on 403")
+    srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Local stand-in for the RAK judgments portal, for offline benchmarks.
+
+    python bench/fake_portal.py [--port 8765] [--rows 300] [--latency 0.05] [--page 15]
+
+Serves only what the scrapers rely on:
+
+* `/portal`: nested iframes (root → iframe[1] → iframe[0] → app), as rak_scrape sees it
+* `/wd`: the Web Dynpro app itself, as app.py and main.py open it
+  (`/wd?auto=1` runs a search on load, standing in for the manual pick in main.py)
+* `data-hint` combo inputs whose lists render `div[ct='LIB_I'].lsListbox__value`
+  options, `#WD6D` (case number), `#WD6F` (search) and `#WD71` (clear)
+* `div#urBusyIndicator1`, visible while a server round trip is in flight
+* `table[ct='ST']`: a virtualised grid of `--page` rows that moves with
+  ArrowDown/ArrowUp/PageDown/PageUp and fetches the new window from the server
+* the "نص الحكم" detail view with the `عودة` back button
+
+Every `/api/*` call sleeps `--latency` seconds (± `--jitter`). Row data are
+generated deterministically from the filters.
+"""
+from __future__ import annotations
+import argparse, json, random, threading, time, zlib
+from datetime import date, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+OPTIONS = {
+    "court": ["محكمة أول درجة", "محكمة الاستئناف", "محكمة التمييز"],
+    "clas": ["مدني", "تجاري", "جزائي", "عمالي"],
+    "ctype": ["مدني كلي", "مدني جزئي", "تجاري كلي"],
+    "year": [str(y) for y in range(2018, 2026)],
+}
+HEADER = ["", "رقم القضية", "المحكمة", "تاريخ القيد", "تاريخ الحكم", "رقم الوثيقة", ""]
+COOKIE = "SAP_SESSIONID_FAKE"
+
+_PORTAL = """<!doctype html><html><body style="margin:0">
+<iframe src="/blank" style="width:100%;height:40px;border:0"></iframe>
+<iframe src="/shell" style="width:100%;height:1000px;border:0"></iframe></body></html>"""
+_SHELL = """<!doctype html><html><body style="margin:0">
+<iframe src="/wd" style="width:100%;height:980px;border:0"></iframe></body></html>"""
+
+_APP = r"""<!doctype html><html dir="rtl"><head><meta charset="utf-8">
+<style>
+ body{font-family:sans-serif} .lsField{margin:4px} .btn{display:inline-block;padding:4px 12px;border:1px solid #888;cursor:pointer}
+ #urBusyIndicator1{position:fixed;top:0;left:0;padding:4px;background:#fd0}
+ #lb{position:absolute;background:#fff;border:1px solid #888;z-index:5}
+ #lb div{padding:2px 8px;cursor:pointer} table[ct='ST'] td{border:1px solid #ccc;padding:2px 6px}
+</style></head><body>
+<div id="urBusyIndicator1" style="display:none">…</div>
+<div id="form">
+ <div class="lsField"><label>درجة القضاء</label> <input class="combo" readonly data-kind="court" data-hint="ZDE_COURT_TYPE"></div>
+ <div class="lsField"><label>التصنيف</label> <input class="combo" readonly data-kind="clas" data-hint="ZDE_COURT_CLASSIFY_TYPE"></div>
+ <div class="lsField"><label>النوع</label> <input class="combo" readonly data-kind="ctype" data-hint="SCMGCASE_TYPE"></div>
+ <div class="lsField"><label>السنة</label> <input class="combo" readonly data-kind="year" data-hint="ZADTEL000019"></div>
+ <div class="lsField"><label>رقم القضية</label> <input id="WD6D"></div>
+ <div id="WD6F" class="btn" role="button">بحث</div> <div id="WD71" class="btn" role="button">مسح</div>
+</div>
+<div id="results"></div>
+<div id="lb" style="display:none"></div>
+<script>
+const PAGE = %(page)d, HDR = %(header)s, AUTO = %(auto)s;
+const $ = s => document.querySelector(s);
+const esc = s => String(s).replace(/[&<>"]/g, c => ({"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;"}[c]));
+const st = {court:"", clas:"", ctype:"", year:"", num:"", top:0, cursor:0, total:0, rows:[], open:null, view:"form"};
+let inflight = 0;
+
+async function api(path) {
+  inflight++; $("#urBusyIndicator1").style.display = "block";
+  try {
+    const r = await fetch(path, {credentials: "same-origin"});
+    return (r.headers.get("content-type") || "").includes("json") ? r.json() : r.text();
+  } finally { if (--inflight === 0) $("#urBusyIndicator1").style.display = "none"; }
+}
+const qs = o => new URLSearchParams(o).toString();
+
+// ── combos ──
+async function openList(inp) {
+  if (st.open === inp) return;
+  closeList(); st.open = inp;
+  const opts = await api("/api/options?" + qs({kind: inp.dataset.kind, court: st.court, clas: st.clas}));
+  if (st.open !== inp) return;
+  const lb = $("#lb"); lb.innerHTML = "";
+  for (const o of opts) {
+    const d = document.createElement("div");
+    d.setAttribute("ct", "LIB_I"); d.className = "lsListbox__value"; d.setAttribute("role", "option");
+    d.textContent = o; d.onclick = e => { e.stopPropagation(); choose(inp, o); };
+    lb.appendChild(d);
+  }
+  const r = inp.getBoundingClientRect();
+  lb.style.top = (r.bottom + window.scrollY) + "px"; lb.style.left = (r.left + window.scrollX) + "px";
+  lb.style.display = "block";
+}
+function closeList() { st.open = null; $("#lb").style.display = "none"; $("#lb").innerHTML = ""; }
+async function choose(inp, v) {
+  closeList(); inp.value = v; st[inp.dataset.kind] = v;
+  await api("/api/select?" + qs({kind: inp.dataset.kind, value: v}));
+}
+for (const inp of document.querySelectorAll("input.combo")) {
+  inp.addEventListener("click", e => { e.stopPropagation(); openList(inp); });
+  inp.addEventListener("keydown", e => {
+    if (e.key === "ArrowDown" && st.open !== inp) { e.preventDefault(); e.stopPropagation(); openList(inp); }
+    else if (e.key === "Escape") closeList();
+  });
+}
+document.addEventListener("click", e => { if (st.open && !$("#lb").contains(e.target)) closeList(); });
+
+// ── search + virtualised grid ──
+async function search() {
+  closeList(); st.num = $("#WD6D").value.trim(); st.top = 0; st.cursor = 0;
+  await loadWindow();
+}
+async function loadWindow() {
+  const d = await api("/api/rows?" + qs({court: st.court, clas: st.clas, ctype: st.ctype, year: st.year,
+                                         num: st.num, offset: st.top, n: PAGE}));
+  st.total = d.total; st.rows = d.rows; renderGrid();
+}
+function renderGrid() {
+  if (st.view !== "form") return;
+  const tr = (cells, i) => `<tr role="row" aria-rowindex="${i + 1}">` + cells.map((c, j) =>
+    j === 6 && i > 0 ? `<td><a class="lnk">${esc(c)}</a></td>` : `<td><span>${esc(c)}</span></td>`).join("") + "</tr>";
+  $("#results").innerHTML = `<table ct="ST" role="grid" aria-rowcount="${st.total + 1}"><tbody>` +
+    tr(HDR, 0) + st.rows.map((r, k) => tr(r, st.top + k + 1)).join("") + "</tbody></table>";
+}
+function moveCursor(c) {
+  if (!st.total) return;
+  st.cursor = Math.max(0, Math.min(st.total - 1, c));
+  let top = st.top;
+  if (st.cursor >= top + PAGE) top = st.cursor - PAGE + 1;
+  if (st.cursor < top) top = st.cursor;
+  if (top !== st.top) { st.top = top; clearTimeout(moveCursor.t); moveCursor.t = setTimeout(loadWindow, 20); }
+}
+document.addEventListener("keydown", e => {
+  if (st.open || st.view !== "form" || !st.total) return;
+  const step = {ArrowDown: 1, ArrowUp: -1, PageDown: PAGE, PageUp: -PAGE}[e.key];
+  if (!step) return;
+  e.preventDefault(); moveCursor(st.cursor + step);
+});
+$("#results").addEventListener("click", e => {
+  const td = e.target.closest("table[ct='ST'] td"); if (!td) return;
+  const tr = td.parentElement, i = +tr.getAttribute("aria-rowindex") - 2;
+  if (i < 0) return;
+  st.cursor = i;
+  if (td.cellIndex === 6) openDetail(st.rows[i - st.top]);
+});
+
+// ── detail view ──
+async function openDetail(row) {
+  const html = await api("/api/detail?" + qs({doc: row[5]}));
+  st.view = "detail"; $("#form").style.display = "none";
+  $("#results").innerHTML = `<div id="detail">${html}</div><div class="btn" role="button" title="عودة">عودة</div>`;
+  $("#results [title='عودة']").onclick = back;
+}
+async function back() {
+  await api("/api/select?" + qs({kind: "back"}));
+  st.view = "form"; $("#form").style.display = ""; renderGrid();
+}
+
+$("#WD6F").onclick = search;
+$("#WD71").onclick = () => {
+  for (const inp of document.querySelectorAll("input.combo")) { inp.value = ""; st[inp.dataset.kind] = ""; }
+  $("#WD6D").value = ""; st.total = 0; st.rows = []; $("#results").innerHTML = "";
+};
+if (AUTO) {
+  for (const [k, v] of Object.entries(AUTO)) { st[k] = v; const i = document.querySelector(`input[data-kind=${k}]`); if (i) i.value = v; }
+  search();
+}
+</script></body></html>"""
+
+
+class Portal:
+    """Deterministic data behind the fake portal."""
+
+    def __init__(self, rows=300, latency=0.05, jitter=0.0, page=15, detail_paras=8):
+        self.rows, self.latency, self.jitter, self.page = rows, latency, jitter, page
+        self.detail_paras = detail_paras
+        self.docs: dict[str, tuple] = {}
+        self.hits = 0
+        self._mx = threading.Lock()
+
+    def sleep(self):
+        with self._mx: self.hits += 1
+        d = self.latency + random.uniform(-self.jitter, self.jitter)
+        if d > 0: time.sleep(d)
+
+    def row(self, f, i):
+        year = int(f.get("year") or 2024)
+        judged = date(year, 12, 28) - timedelta(days=i // 2)
+        filed = judged - timedelta(days=60 + i % 30)
+        ctype = f.get("ctype") or "مدني كلي"
+        doc = str(zlib.crc32(f"{f.get('court')}|{f.get('clas')}|{ctype}|{year}|{i}".encode()) % 10**8)
+        row = ["", f"{i + 1} / {year}  {ctype}", f.get("court") or "محكمة أول درجة",
+               filed.strftime("%d.%m.%Y"), judged.strftime("%d.%m.%Y"), doc, "نص الحكم"]
+        self.docs[doc] = (row, i)
+        return row
+
+    def search(self, f, offset, n):
+        idx = range(self.rows)
+        if f.get("num"): idx = [i for i in idx if str(i + 1) == f["num"].strip()]
+        idx = list(idx)
+        return {"total": len(idx), "rows": [self.row(f, i) for i in idx[offset:offset + n]]}
+
+    def detail(self, doc):
+        row, i = self.docs[doc]
+        para = ("وحيث إن المحكمة قد اطلعت على أوراق الدعوى ومستنداتها وسمعت المرافعة، "
+                "فإنها تقضي بما هو مبين في المنطوق. ")
+        return ("<h3>نص الحكم</h3>"
+                f"<p>رقم القضية: {escape(row[1])}</p><p>المحكمة: {escape(row[2])}</p>"
+                f"<p>تاريخ القيد: {row[3]}</p><p>تاريخ الحكم: {row[4]}</p><p>رقم الوثيقة: {doc}</p>"
+                f"<p>المدعى: شركة النموذج رقم {i + 1} ذ.م.م</p><p>المدعى عليه: مؤسسة الاختبار {i % 17 + 1}</p>"
+                + "".join(f"<p>{para}</p>" for _ in range(self.detail_paras)))
+
+
+def make_handler(portal: Portal):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *a): pass
+
+        def send(self, body, ctype="text/html; charset=utf-8", status=200, cookie=False):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            if cookie: self.send_header("Set-Cookie", f"{COOKIE}=1; Path=/")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            u = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(u.query).items()}
+            p = u.path
+            if p in ("/", "/portal"): return self.send(_PORTAL)
+            if p == "/shell": return self.send(_SHELL)
+            if p == "/blank": return self.send("<!doctype html><body></body>")
+            if p == "/wd":
+                auto = {k: q.get(k, OPTIONS[k][0] if k in ("court", "year") else "")
+                        for k in ("court", "clas", "ctype", "year")} if q.get("auto") else None
+                return self.send(_APP % {"page": portal.page, "auto": json.dumps(auto or False),
+                                         "header": json.dumps(HEADER, ensure_ascii=False)}, cookie=True)
+            if not p.startswith("/api/"): return self.send("not found", status=404)
+            portal.sleep()
+            if p == "/api/options":
+                return self.send(json.dumps(OPTIONS.get(q.get("kind"), [])), "application/json")
+            if p == "/api/select":
+                return self.send("{}", "application/json")
+            if p == "/api/rows":
+                res = portal.search(q, int(q.get("offset", 0)), int(q.get("n", portal.page)))
+                return self.send(json.dumps(res, ensure_ascii=False), "application/json; charset=utf-8")
+            if p == "/api/detail":
+                if COOKIE not in (self.headers.get("Cookie") or ""):
+                    return self.send("session expired", status=403)
+                if q.get("doc") not in portal.docs: return self.send("unknown document", status=404)
+                return self.send(portal.detail(q["doc"]))
+            self.send("not found", status=404)
+    return Handler
+
+
+def serve(port=0, **kw):
+    """Start the portal on a daemon thread; returns (server, base_url, portal)."""
+    portal = Portal(**kw)
+    srv = ThreadingHTTPServer(("127.0.0.1", port), make_handler(portal))
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}", portal
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--rows", type=int, default=300)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--page", type=int, default=15)
+    a = ap.parse_args()
+    srv, base, _ = serve(a.port, rows=a.rows, latency=a.latency, jitter=a.jitter, page=a.page)
+    print(f"fake portal on {base}/portal (app: {base}/wd)")
+    try: threading.Event().wait()
+    except KeyboardInterrupt: srv.shutdown()
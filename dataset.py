@@ -0,0 +1,156 @@
+"""Parsed, columnar export of scraped judgments (Parquet or Arrow IPC).
+
+    python dataset.py Data/*.jsonl                     # → Data/dataset/
+    python dataset.py Data/result_ab12.jsonl --format arrow --out Data/arrow
+
+Each scraper output (JSON or JSONL) is parsed once, in batches, with the
+precompiled patterns below: case number / year / type from "8 / 2019  مدني كلي",
+court level, filing and judgment dates, document id, and the parties listed
+under "مدعى" / "مدعى عليه" in the judgment text. The rows are written as a
+typed dataset partitioned by court and judgment year
+(`court=…/year=2021/<source file name>-<batch>-0.parquet`), so a query reads
+only the partitions and columns it needs:
+
+    pyarrow.dataset.dataset("Data/dataset", partitioning="hive").to_table(
+        columns=["case_no", "judged"], filter=pc.field("year") == 2021)
+
+Needs `pyarrow`; `parse_record` works without it. Re-exporting a source
+replaces all of its own files (and only those).
+"""
+from __future__ import annotations
+import argparse, datetime as dt, re
+from pathlib import Path
+
+from sink import iter_records
+from textnorm import normalize
+
+try:
+    import pyarrow as pa, pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
+DATASET_DIR = Path("Data") / "dataset"
+
+# ── patterns (compiled once) ───────────────────────────────────
+CASE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d{4})\s+(.+?)\s*$")
+DATE_RE = re.compile(r"^\s*(\d{1,2})[./](\d{1,2})[./](\d{4})\s*$")
+DOC_RE = re.compile(r"^\s*(\d+)\s*$")
+SESSION_RE = re.compile(r"المنعقدة\s+يوم\s+(\d{1,2}[./]\d{1,2}[./]\d{4})")
+COURT_RE = re.compile(r"^\s*(محكمة\s+.+?)\s*$", re.M)
+# portal layout: a "مدعى" heading line, one party per line, then "مدعى عليه"
+PARTIES_RE = re.compile(r"^[ \t]*مدعى[ \t]*\n(?P<plaintiffs>.*?)^[ \t]*مدعى[ \t]+عليه[ \t]*\n"
+                        r"(?P<defendants>.*?)^[ \t]*(?:أص\S*\s+ال\S*|بعد\b|حيث\b)", re.M | re.S)
+# inline layout: "المدعى: …" / "المدعى عليه: …"
+PLAINTIFF_RE = re.compile(r"^[ \t]*(?:ال)?مدعى[ \t]*:[ \t]*(.+?)[ \t]*$", re.M)
+DEFENDANT_RE = re.compile(r"^[ \t]*(?:ال)?مدعى[ \t]+عليه[ \t]*:[ \t]*(.+?)[ \t]*$", re.M)
+TATWEEL = str.maketrans("", "", "ـ")
+
+if pa:
+    SCHEMA = pa.schema([
+        ("rid", pa.string()), ("case_no", pa.string()), ("case_num", pa.int32()),
+        ("case_year", pa.int16()), ("case_type", pa.string()), ("court", pa.string()),
+        ("filed", pa.date32()), ("judged", pa.date32()), ("session", pa.date32()),
+        ("doc_id", pa.int64()), ("court_name", pa.string()),
+        ("plaintiffs", pa.list_(pa.string())), ("defendants", pa.list_(pa.string())),
+        ("detail_text", pa.string()), ("source", pa.string()), ("year", pa.int16()),
+    ])
+
+
+def parse_date(txt):
+    m = DATE_RE.match(normalize(txt or ""))
+    if not m: return None
+    try: return dt.date(int(m[3]), int(m[2]), int(m[1]))
+    except ValueError: return None
+
+
+def _names(block):
+    return [n for n in (normalize(ln) for ln in block.splitlines()) if n]
+
+
+def parse_parties(text) -> tuple[list[str], list[str]]:
+    text = (text or "").translate(TATWEEL)
+    m = PARTIES_RE.search(text)
+    if m: return _names(m["plaintiffs"]), _names(m["defendants"])
+    return ([normalize(x) for x in PLAINTIFF_RE.findall(text)],
+            [normalize(x) for x in DEFENDANT_RE.findall(text)])
+
+
+def parse_record(rec, source="") -> dict:
+    """One scraper record as a flat, typed row (dates as `datetime.date`)."""
+    row = rec.get("row_data") or []
+    cell = lambda i: normalize(row[i]) if i < len(row) and row[i] else ""
+    text = rec.get("detail_text") or ""
+    case_no = cell(1)
+    m = CASE_RE.match(case_no)
+    doc = DOC_RE.match(cell(5))
+    session = SESSION_RE.search(text)
+    court_name = COURT_RE.search(text)
+    plaintiffs, defendants = parse_parties(text)
+    judged = parse_date(cell(4))
+    return {
+        "rid": "|".join(row), "case_no": case_no,
+        "case_num": int(m[1]) if m else None, "case_year": int(m[2]) if m else None,
+        "case_type": m[3] if m else None, "court": cell(2) or None,
+        "filed": parse_date(cell(3)), "judged": judged,
+        "session": parse_date(session[1]) if session else None,
+        "doc_id": int(doc[1]) if doc else None,
+        "court_name": normalize(court_name[1]) if court_name else None,
+        "plaintiffs": plaintiffs, "defendants": defendants,
+        "detail_text": text, "source": source,
+        "year": judged.year if judged else (int(m[2]) if m else None),
+    }
+
+
+def _ext(fmt):
+    return "parquet" if fmt == "parquet" else "arrow"
+
+
+def _clear(out, name, fmt):
+    """Delete the part files of source `name` left by an earlier export."""
+    part = re.compile(re.escape(name) + r"-\d+-\d+\." + _ext(fmt))
+    for f in Path(out).rglob("*." + _ext(fmt)):
+        if part.fullmatch(f.name): f.unlink()
+
+
+def _write(rows, out, fmt, basename):
+    cols = {f.name: [r[f.name] for r in rows] for f in SCHEMA}
+    ds.write_dataset(pa.table(cols, schema=SCHEMA), str(out), format=fmt,
+                     partitioning=ds.partitioning(pa.schema([SCHEMA.field("court"), SCHEMA.field("year")]),
+                                                  flavor="hive"),
+                     basename_template=basename + "-{i}." + _ext(fmt),
+                     existing_data_behavior="overwrite_or_ignore")
+
+
+def export_dataset(paths, out=DATASET_DIR, fmt="parquet", batch=20000) -> int:
+    """Parse every judgment in `paths` and write the partitioned dataset; returns rows written.
+    A row present in several sources (e.g. a `.jsonl` and its exported `.json`) is written once."""
+    if pa is None: raise RuntimeError("the columnar export needs pyarrow (pip install pyarrow)")
+    fmt = "ipc" if fmt in ("arrow", "ipc", "feather") else "parquet"
+    written, seen = 0, set()
+    for path in map(Path, paths):
+        # part files are named after the full file name: X.jsonl and X.json must not collide
+        _clear(out, path.name, fmt)
+        rows, n = [], 0
+        for rec in iter_records(path):
+            rid = "|".join(rec.get("row_data") or [])
+            if not rid or rid in seen: continue
+            seen.add(rid)
+            rows.append(parse_record(rec, path.name))
+            if len(rows) >= batch:
+                _write(rows, out, fmt, f"{path.name}-{n}"); written += len(rows); rows.clear(); n += 1
+        if rows:
+            _write(rows, out, fmt, f"{path.name}-{n}"); written += len(rows)
+    return written
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("paths", nargs="*")
+    ap.add_argument("--out", default=str(DATASET_DIR))
+    ap.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    ap.add_argument("--batch", type=int, default=20000)
+    a = ap.parse_args()
+    # the .jsonl files hold every row; the .json files are exports of them
+    paths = a.paths or sorted(Path("Data").glob("*.jsonl"))
+    n = export_dataset(paths, a.out, a.format, a.batch)
+    print(f"✓ {n} judgments → {Path(a.out).resolve()}")
@@ -0,0 +1,296 @@
+"""Fetch judgment detail pages over HTTP instead of click → load → back.
+
+The first detail page of a run is still opened by clicking "نص الحكم".
+The request that click sends is read from Chrome's performance log, and
+the value of the row that appears in it (document id, case number, ...)
+becomes a template slot. Later rows are fetched by replaying that
+request with their own value through a pooled `requests.Session`, which
+carries the browser's cookies, on a small thread pool. The browser keeps
+scrolling the grid in the meantime. The cookies are copied again every
+`resync_every` rows, and before a 401/403 is retried once.
+
+`TabFetcher` replays the same template inside the browser instead: a
+few extra tabs of the grid's own session load detail pages side by side
+while the grid tab stays put, so no back click or grid re-render is
+needed. It suits portals that only answer requests carrying the
+browser's full state.
+
+The template is kept only if replaying it for the calibration row
+returns the same judgment the click showed. Otherwise the caller keeps
+clicking.
+"""
+from __future__ import annotations
+import json, re, threading, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import quote, quote_plus
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+
+def enable_network_log(options):
+    """Turn on the performance log that `capture_request` reads."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def drain_network_log(driver):
+    """Discard buffered performance-log entries (call right before the click)."""
+    try: driver.get_log("performance")
+    except Exception: pass
+
+
+@dataclass
+class RequestTemplate:
+    method: str
+    url: str
+    headers: dict
+    body: str | None
+    col: int            # row_data column whose value was found in the request
+    value: str          # that value, as sent by the calibration click
+
+    def render(self, row_data) -> tuple[str, str | None]:
+        new = row_data[self.col].strip()
+        pairs = {enc(self.value): enc(new) for enc in _ENCODINGS}
+        sub = lambda s: _slot_re(pairs).sub(lambda m: pairs[m.group(0)], s) if s else s
+        return sub(self.url), sub(self.body)
+
+
+_ENCODINGS = (str, quote, quote_plus)
+
+def _slot_re(variants):
+    """Whole-token match of any encoding of a value (so "14" won't hit "2014")."""
+    alts = "|".join(map(re.escape, sorted(variants, key=len, reverse=True)))
+    return re.compile(rf"(?<![0-9A-Za-z%])(?:{alts})(?![0-9A-Za-z])")
+
+
+def _sent_requests(driver):
+    """`Network.requestWillBeSent` params from the performance log, oldest first."""
+    out = []
+    for entry in driver.get_log("performance"):
+        try: msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError): continue
+        if msg.get("method") == "Network.requestWillBeSent":
+            p = msg.get("params", {})
+            if p.get("type") in ("Document", "XHR", "Fetch"):
+                out.append(p["request"])
+    return out
+
+
+def capture_request(driver, row_data, cols=(5, 1)) -> RequestTemplate | None:
+    """Find the request the detail click sent and turn it into a template.
+
+    `cols` are the row_data columns tried as the per-row key, most
+    specific first (document id, then case number).
+    """
+    reqs = _sent_requests(driver)
+    for col in cols:
+        if col >= len(row_data) or not row_data[col].strip(): continue
+        val = row_data[col].strip()
+        for req in reversed(reqs):          # the click's request is the latest match
+            hay = req.get("url", "") + "\n" + (req.get("postData") or "")
+            if _slot_re({enc(val) for enc in _ENCODINGS}).search(hay):
+                hdrs = {k: v for k, v in req.get("headers", {}).items()
+                        if not k.startswith(":") and k.lower() not in ("cookie", "content-length")}
+                return RequestTemplate(req.get("method", "GET"), req["url"], hdrs,
+                                       req.get("postData"), col, val)
+    return None
+
+
+def html_to_text(html: str) -> str:
+    """Visible text, one block per line, roughly like WebElement.text of <body>."""
+    soup = BeautifulSoup(html, "lxml")
+    for t in soup(["script", "style", "noscript"]): t.decompose()
+    lines = (re.sub(r"[ \t\xa0]+", " ", ln).strip() for ln in soup.get_text("\n").splitlines())
+    return "\n".join(ln for ln in lines if ln)
+
+
+class DetailFetcher:
+    """Replays a `RequestTemplate` concurrently with the browser's cookies."""
+
+    def __init__(self, driver, template: RequestTemplate, workers=4, timeout=30, resync_every=200):
+        self.driver, self.template, self.timeout = driver, template, timeout
+        self.resync_every, self.sent = resync_every, 0
+        self._sync_lock = threading.Lock()
+        self._synced = 0                    # bumped on every cookie sync
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=2)
+        self.session.mount("https://", adapter); self.session.mount("http://", adapter)
+        self.session.headers.update(template.headers)
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        self.sync_cookies()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail")
+
+    def sync_cookies(self, since=None):
+        """Copy the browser's cookies; skipped if another thread synced after `since`."""
+        with self._sync_lock:
+            if since is not None and since != self._synced: return
+            for c in self.driver.get_cookies():
+                self.session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+            self._synced += 1
+
+    def _request(self, row_data):
+        url, body = self.template.render(row_data)
+        return self.session.request(self.template.method, url, data=body.encode("utf-8") if body else None,
+                                    timeout=self.timeout)
+
+    def fetch(self, row_data) -> str:
+        synced = self._synced
+        r = self._request(row_data)
+        if r.status_code in (401, 403):     # the browser's session cookies rotated: pick them up, retry once
+            self.sync_cookies(since=synced)
+            r = self._request(row_data)
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+        return html_to_text(r.text)
+
+    def submit(self, row_data):
+        self.sent += 1
+        if self.resync_every and self.sent % self.resync_every == 0: self.sync_cookies()
+        return self.pool.submit(self.fetch, row_data)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.session.close()
+
+
+# ── in-browser tabs ────────────────────────────────────────────
+# Tabs are opened from the grid tab with window.open; their window objects
+# are kept in the grid frame so readiness and text are read without ever
+# switching the WebDriver's window. The document a tab held before a new
+# load is tagged, so a stale "complete" page is never taken for the answer.
+_TAB_OPEN_JS = r"""
+const [name, method, url, body] = arguments;
+const tabs = window.__rakTabs = window.__rakTabs || {};
+let w = tabs[name];
+if (!w || w.closed) w = tabs[name] = window.open("about:blank", name);
+if (!w) return "popup blocked";
+try { w.document.__rakOld = true; } catch (e) { return String(e); }
+if (method === "GET") { w.location.href = url; return null; }
+const f = document.createElement("form");
+f.method = "POST"; f.action = url; f.target = name; f.style.display = "none";
+for (const [k, v] of new URLSearchParams(body || "")) {
+  const i = document.createElement("input"); i.type = "hidden"; i.name = k; i.value = v; f.appendChild(i);
+}
+document.body.appendChild(f); f.submit(); f.remove();
+return null;
+"""
+
+_TAB_POLL_JS = r"""
+const tabs = window.__rakTabs || {}, out = {};
+for (const name of arguments[0]) {
+  const w = tabs[name];
+  try {
+    if (!w || w.closed) { out[name] = {err: "tab closed"}; continue; }
+    const d = w.document;
+    if (d.__rakOld || d.readyState !== "complete" || !d.body) continue;
+    d.__rakOld = true;
+    out[name] = {text: d.body.innerText};
+  } catch (e) { out[name] = {err: String(e)}; }
+}
+return out;
+"""
+
+_TAB_CLOSE_JS = "for (const w of Object.values(window.__rakTabs || {})) try { w.close(); } catch (e) {} window.__rakTabs = {};"
+
+
+class _TabJob:
+    """Future-like handle; `done`/`result` drive the owning fetcher (same thread)."""
+    def __init__(self, owner, row_data):
+        self.owner, self.row_data, self.slot, self.t0 = owner, row_data, None, 0.0
+        self._text = self._err = None
+
+    def done(self) -> bool:
+        if self._text is None and self._err is None: self.owner.pump()
+        return self._text is not None or self._err is not None
+
+    def result(self):
+        deadline = time.time() + self.owner.timeout * 2
+        while not self.done():
+            if time.time() > deadline: raise TimeoutError("detail tab timed out")
+            time.sleep(self.owner.poll)
+        if self._err is not None: raise RuntimeError(self._err)
+        return self._text
+
+
+class TabFetcher:
+    """Loads detail pages in `workers` extra tabs of the same browser.
+
+    Same interface as `DetailFetcher`, but not thread-safe: every call,
+    including `done()` on a submitted job, must come from the thread that
+    owns the driver. Only GET and urlencoded POST templates can be replayed.
+    """
+
+    def __init__(self, driver, template: RequestTemplate, workers=3, timeout=30, poll=0.05):
+        ctype = next((v for k, v in template.headers.items() if k.lower() == "content-type"), "")
+        if template.method not in ("GET", "POST") or (template.body and "urlencoded" not in ctype):
+            raise ValueError(f"cannot replay {template.method} {ctype or ''} in a tab")
+        self.driver, self.template, self.timeout, self.poll = driver, template, timeout, poll
+        self.free = deque(f"rak_detail_{i}" for i in range(workers))
+        self.busy: dict[str, _TabJob] = {}
+        self.queue: deque[_TabJob] = deque()
+
+    def _start(self, job):
+        slot = self.free.popleft()
+        url, body = self.template.render(job.row_data)
+        err = self.driver.execute_script(_TAB_OPEN_JS, slot, self.template.method, url, body)
+        if err:
+            self.free.append(slot); job._err = err; return
+        job.slot, job.t0 = slot, time.time()
+        self.busy[slot] = job
+
+    def pump(self):
+        """Collect finished tabs and start queued jobs on the freed ones."""
+        if self.busy:
+            done = self.driver.execute_script(_TAB_POLL_JS, list(self.busy)) or {}
+            now = time.time()
+            for slot, job in list(self.busy.items()):
+                res = done.get(slot)
+                if res is None and now - job.t0 > self.timeout: res = {"err": "detail tab timed out"}
+                if res is None: continue
+                job._text, job._err = res.get("text"), res.get("err")
+                if job._text is not None: job._text = job._text.strip()
+                del self.busy[slot]; self.free.append(slot)
+        while self.free and self.queue:
+            self._start(self.queue.popleft())
+
+    def submit(self, row_data) -> _TabJob:
+        job = _TabJob(self, row_data)
+        self.queue.append(job)
+        self.pump()
+        return job
+
+    def fetch(self, row_data) -> str:
+        return self.submit(row_data).result()
+
+    def close(self):
+        try: self.driver.execute_script(_TAB_CLOSE_JS)
+        except Exception: pass
+
+
+def calibrate(driver, row_data, clicked_text, norm=lambda s: " ".join(s.split()), workers=4,
+              fetcher_cls=None):
+    """Build a fetcher (`DetailFetcher` by default, or `TabFetcher`) from the
+    click that just happened, or None if the captured request cannot be
+    replayed faithfully."""
+    tpl = capture_request(driver, row_data)
+    if tpl is None: return None
+    try:
+        fetcher = (fetcher_cls or DetailFetcher)(driver, tpl, workers)
+    except ValueError:
+        return None
+    try:
+        got = norm(fetcher.fetch(row_data))
+    except Exception:
+        fetcher.close()
+        return None
+    # same judgment? the case number cell and a chunk of the body must match
+    ref = norm(clicked_text)
+    probe = ref[len(ref) // 2: len(ref) // 2 + 80]
+    if norm(row_data[1]) in got and probe in got:
+        return fetcher
+    fetcher.close()
+    return None
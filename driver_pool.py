@@ -0,0 +1,90 @@
+"""Pool of pre-warmed WebDriver sessions for the Gradio app.
+
+Each callback checks a driver out, uses it and hands it back, so one
+user's search no longer blocks everyone else. Drivers are health-checked
+on checkout and replaced when they are broken.
+"""
+from __future__ import annotations
+import queue, threading
+from contextlib import contextmanager
+
+
+class DriverPool:
+    """Fixed-size pool. `factory()` builds a driver, `prepare(d)` parks it on
+    the form, `check(d)` is the cheap health probe run on every checkout."""
+
+    def __init__(self, factory, size=2, prepare=None, check=None, timeout=120):
+        self.factory, self.prepare, self.check = factory, prepare, check
+        self.size, self.timeout = max(1, size), timeout
+        self._idle: queue.Queue = queue.Queue()
+        self._all: set = set()
+        self._mx = threading.Lock()
+        for _ in range(self.size):
+            self._idle.put(None)        # empty slot, filled lazily or by warm()
+
+    # ── lifecycle ──
+    def _new(self):
+        d = self.factory()
+        try:
+            if self.prepare: self.prepare(d)
+        except Exception:
+            _quit(d); raise
+        with self._mx: self._all.add(d)
+        return d
+
+    def _drop(self, d):
+        with self._mx: self._all.discard(d)
+        _quit(d)
+
+    def warm(self, background=True):
+        """Fill every empty slot now (in parallel threads if `background`)."""
+        def fill():
+            try: d = self._idle.get_nowait()
+            except queue.Empty: return
+            if d is None:
+                try: d = self._new()
+                except Exception: d = None
+            self._idle.put(d)
+        ts = [threading.Thread(target=fill, daemon=True) for _ in range(self.size)]
+        for t in ts: t.start()
+        if not background:
+            for t in ts: t.join()
+
+    def _healthy(self, d) -> bool:
+        try:
+            d.execute_script("return 1")
+            if self.check: self.check(d)
+            return True
+        except Exception:
+            return False
+
+    # ── checkout ──
+    @contextmanager
+    def driver(self):
+        d = self._idle.get(timeout=self.timeout)
+        try:
+            if d is not None and not self._healthy(d):
+                self._drop(d); d = None
+            if d is None:
+                d = self._new()
+        except Exception:
+            self._idle.put(None)
+            raise
+        try:
+            yield d
+        except Exception:
+            # a failed callback may have wedged the session; recycle it if so
+            if not self._healthy(d):
+                self._drop(d); d = None
+            raise
+        finally:
+            self._idle.put(d)
+
+    def close(self):
+        with self._mx: ds, self._all = list(self._all), set()
+        for d in ds: _quit(d)
+
+
+def _quit(d):
+    try: d.quit()
+    except Exception: pass
@@ -0,0 +1,80 @@
+"""Memoised iframe navigation.
+
+The portal nests its Web Dynpro form and grid a few iframes deep. Instead
+of a recursive `find_element` + `switch_to.frame` walk on every search,
+`FrameLocator` remembers the iframe index path that led to each target.
+It follows that path and confirms it with one probe. Only when the probe
+fails (the portal layout changed) does it fall back to a full search, and
+then it learns the new path.
+"""
+from __future__ import annotations
+import json, os, threading
+from pathlib import Path
+
+from selenium.webdriver.common.by import By
+
+# named targets: probe locator that must exist inside the right frame
+TARGETS = {
+    "form": (By.CSS_SELECTOR, 'input[data-hint*="ZDE_COURT_TYPE"]'),
+    "grid": (By.CSS_SELECTOR, "table[ct='ST']"),
+}
+
+
+class FrameLocator:
+    def __init__(self, path=None, seed=None):
+        self.path = Path(path) if path else None
+        self.paths: dict[str, list[int]] = dict(seed or {})
+        self._mx = threading.Lock()
+        if self.path:
+            try: self.paths.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except (OSError, ValueError): pass
+
+    # ── navigation ──
+    @staticmethod
+    def follow(drv, path) -> bool:
+        """Switch from the top document along `path`; False if a hop is missing."""
+        drv.switch_to.default_content()
+        for idx in path:
+            frames = drv.find_elements(By.TAG_NAME, "iframe")
+            if idx >= len(frames): return False
+            drv.switch_to.frame(frames[idx])
+        return True
+
+    def _search(self, drv, probe, path):
+        if drv.find_elements(*probe): return path
+        for i, fr in enumerate(drv.find_elements(By.TAG_NAME, "iframe")):
+            drv.switch_to.frame(fr)
+            found = self._search(drv, probe, path + [i])
+            if found is not None: return found
+            drv.switch_to.parent_frame()
+        return None
+
+    def enter(self, drv, name, probe=None, search=True) -> bool:
+        """Leave `drv` inside the frame holding target `name`; True if found.
+
+        With `search=False` a probe miss on an intact cached path is taken
+        to mean "not rendered yet" and no full search is made. On a miss
+        the driver is left on the cached path when it still exists.
+        """
+        probe = probe or TARGETS[name]
+        cached = self.paths.get(name)
+        if cached is not None:
+            if self.follow(drv, cached):
+                if drv.find_elements(*probe): return True
+                if not search: return False
+        drv.switch_to.default_content()
+        found = self._search(drv, probe, [])
+        if found is None:
+            if cached is not None: self.follow(drv, cached)
+            return False
+        if found != cached: self._learn(name, found)
+        return True
+
+    def _learn(self, name, path):
+        with self._mx:
+            self.paths[name] = path
+            if not self.path: return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.paths), encoding="utf-8")
+            os.replace(tmp, self.path)
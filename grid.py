@@ -0,0 +1,68 @@
+"""Bulk reads of the Web Dynpro result grid (`table[ct='ST']`).
+
+One `execute_script` returns the cell texts of every visible row, instead
+of one WebDriver round trip per `find_elements` and per `.text`. Element
+handles are only fetched for the cell that is actually clicked.
+"""
+from __future__ import annotations
+
+from waits import wait_for
+
+TABLE_CSS = "table[ct='ST']"
+
+# Mirrors `[c.text.strip() for c in row.find_elements(By.TAG_NAME, "td")]`:
+# descendant <td>s, rendered text only, nbsp folded to a space.
+_JS_PRELUDE = r"""
+const tbl = document.querySelector("table[ct='ST']");
+const rows = tbl ? Array.from(tbl.querySelectorAll("tbody tr[role='row']")).slice(1) : [];
+const txt = td => td.getClientRects().length ? td.innerText.replace(/\u00a0/g, " ").trim() : "";
+const cellsOf = r => Array.from(r.querySelectorAll("td"));
+const keyOf = r => cellsOf(r).map(txt).join("|");
+"""
+
+ROWS_JS = _JS_PRELUDE + "return rows.map(r => cellsOf(r).map(txt));"
+
+# header row included; direct cells only, like pd.read_html
+TABLE_JS = r"""
+const tbl = document.querySelector("table[ct='ST']");
+if (!tbl) return [];
+return Array.from(tbl.querySelectorAll("tbody tr[role='row']")).map(r =>
+  Array.from(r.children).filter(c => c.tagName === "TD" || c.tagName === "TH")
+    .map(c => c.innerText.replace(/\u00a0/g, " ")));
+"""
+
+CELL_JS = _JS_PRELUDE + """
+const r = rows.find(r => keyOf(r) === arguments[0]);
+return r ? (cellsOf(r)[arguments[1]] || null) : null;
+"""
+
+def read_rows(driver) -> list[list[str]]:
+    """Cell texts of every visible data row (header skipped), in one round trip."""
+    return [[c.strip() for c in row] for row in (driver.execute_script(ROWS_JS) or [])]
+
+
+def read_table(driver) -> list[list[str]]:
+    """Header + data rows of the grid as cell-text lists, in one round trip."""
+    return driver.execute_script(TABLE_JS) or []
+
+
+def row_key(cells) -> str:
+    return "|".join(cells)
+
+
+def cell_for(driver, key, col):
+    """WebElement of column `col` in the visible row whose key is `key`, or None."""
+    return driver.execute_script(CELL_JS, key, col)
+
+
+# wrapped in [] so that an empty key is still a truthy "changed" result
+_NEW_BOTTOM_JS = "(() => {" + _JS_PRELUDE + """
+const k = rows.length ? keyOf(rows[rows.length - 1]) : "";
+return k !== args[2] ? [k] : null; })()"""
+
+
+def wait_new_rows(driver, prev_last_id, timeout=4):
+    """Wait for the bottom row to change (DOM-mutation driven, no polling);
+    returns the new bottom row id, or the old one on timeout."""
+    hit = wait_for(driver, _NEW_BOTTOM_JS, prev_last_id, timeout=timeout)
+    return hit[0].strip() if hit else prev_last_id
@@ -0,0 +1,60 @@
+"""Build the result DataFrame straight from grid cell arrays.
+
+The old path copied the whole `page_source`, built a BeautifulSoup tree,
+ran a `:contains` selector (falling back to `has_arabic` over every
+table), re-serialised the table and handed it to `pd.read_html`. Here
+the rows come either from `grid.read_table` (one `execute_script`) or
+from a single lxml XPath over the `table[ct='ST']` rows, and the
+DataFrame is built directly from the cell texts.
+"""
+from __future__ import annotations
+import re
+
+import pandas as pd
+from lxml import html as lxml_html
+
+HEADERS = ("رقم القضية", "Case/File No.")
+_WS = re.compile(r"\s+")
+_ARABIC = re.compile(r"[\u0600-\u06FF]")
+
+_GRID_ROWS_XP = "//table[@ct='ST']//tbody/tr[@role='row']"
+_ANY_ROWS_XP = ".//tr"
+
+
+def _clean(s: str) -> str:
+    return _WS.sub(" ", s).strip()
+
+
+def rows_to_df(rows) -> pd.DataFrame | None:
+    """First row is the header (as in the SAP grid); ragged rows are padded
+    and the blank placeholder rows the grid renders are dropped."""
+    rows = [[_clean(c) for c in r] for r in rows if r]
+    if len(rows) < 2: return None
+    header, body = rows[0], [r for r in rows[1:] if any(r)]
+    if not body: return None
+    width = max(len(header), *(len(r) for r in body))
+    cols = [h or f"col{i}" for i, h in enumerate(header + [""] * (width - len(header)))]
+    return pd.DataFrame([r + [""] * (width - len(r)) for r in body], columns=cols)
+
+
+def _cells(tr):
+    return [td.text_content() for td in tr.xpath("./td|./th")]
+
+
+def parse_grid_html(html: str) -> pd.DataFrame | None:
+    """DataFrame of the result grid in `html`, or None."""
+    doc = lxml_html.fromstring(html)
+    trs = doc.xpath(_GRID_ROWS_XP)
+    if trs:
+        return rows_to_df([_cells(tr) for tr in trs])
+    # layouts without the ct='ST' marker: header text first, then any Arabic table
+    tables = doc.xpath("//table")
+    for tbl in tables:
+        first = tbl.xpath(_ANY_ROWS_XP)[:1]
+        if first and any(h in first[0].text_content() for h in HEADERS):
+            return rows_to_df([_cells(tr) for tr in tbl.xpath(_ANY_ROWS_XP)])
+    for tbl in tables:
+        trs = tbl.xpath(_ANY_ROWS_XP)
+        if len(trs) >= 3 and _ARABIC.search(trs[0].text_content()):
+            return rows_to_df([_cells(tr) for tr in trs])
+    return None
@@ -0,0 +1,205 @@
+"""Content-addressed, compressed archive of judgment texts.
+
+    python judgment_store.py ingest Data/*.json Data/*.jsonl
+    python judgment_store.py get "12 / 2024  مدني كلي"
+    python judgment_store.py stats
+
+Every `detail_text` is hashed (BLAKE2b) and stored once in an append-only
+pack file (`Data/store/bodies.pack`), however many runs or overlapping
+searches scraped it. Bodies are compressed against a dictionary built
+from the first batch, so the shared header, court preamble and ruler's
+title cost almost nothing per judgment. zstd with a trained dictionary
+is used when `zstandard` is installed. Otherwise zlib with a preset
+dictionary of the most common lines is used. A SQLite index
+(`Data/store/index.sqlite`, row ids kept as 12-byte digests) maps grid
+rows and case numbers to their body, so reading one judgment seeks to one record instead of loading a
+whole JSON file.
+"""
+from __future__ import annotations
+import argparse, hashlib, json, os, sqlite3, zlib
+from collections import Counter
+from pathlib import Path
+
+from sink import iter_records
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STORE_DIR = Path("Data") / "store"
+ZDICT_MAX = 32 * 1024           # deflate window: bytes of zdict that can be referenced
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dicts (id INTEGER PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS bodies (
+    hash TEXT PRIMARY KEY, off INTEGER NOT NULL, len INTEGER NOT NULL,
+    raw_len INTEGER NOT NULL, codec TEXT NOT NULL, dict INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS judgments (
+    id INTEGER PRIMARY KEY, rid BLOB UNIQUE NOT NULL, case_no TEXT, court TEXT, judged TEXT,
+    doc_id TEXT, row_json TEXT NOT NULL, hash TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS judgments_case ON judgments (case_no);
+"""
+
+
+def body_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def zlib_dict(samples) -> bytes:
+    """Preset dictionary: lines shared by many samples, most frequent last
+    (deflate reaches nearer bytes more cheaply)."""
+    lines = Counter(ln for s in samples for ln in set(s.splitlines()) if len(ln) > 3)
+    floor = max(2, len(samples) // 4)
+    common = sorted((n, ln) for ln, n in lines.items() if n >= floor)
+    return "\n".join(ln for _, ln in common).encode("utf-8")[-ZDICT_MAX:]
+
+
+class JudgmentStore:
+    """Single-writer store; readers may open the same directory concurrently."""
+
+    def __init__(self, root=STORE_DIR, train_min=50):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self.pack_path = self.root / "bodies.pack"
+        self.pack = open(self.pack_path, "ab+")
+        self.train_min = train_min
+        self._dicts: dict[int, tuple[str, bytes]] = {
+            i: (c, d) for i, c, d in self.db.execute("SELECT id, codec, data FROM dicts")}
+
+    # ── codecs ──
+    def _current_dict(self) -> int:
+        return max(self._dicts, default=0)
+
+    def train(self, samples) -> int:
+        """Build and keep a dictionary from sample bodies; returns its id."""
+        if zstandard:
+            codec, data = "zstd", zstandard.train_dictionary(
+                64 * 1024, [s.encode("utf-8") for s in samples]).as_bytes()
+        else:
+            codec, data = "zlib", zlib_dict(samples)
+        cur = self.db.execute("INSERT INTO dicts (codec, data) VALUES (?, ?)", (codec, data))
+        self.db.commit()
+        self._dicts[cur.lastrowid] = (codec, data)
+        return cur.lastrowid
+
+    def _compress(self, raw: bytes, dict_id: int) -> tuple[bytes, str]:
+        codec, data = self._dicts.get(dict_id, ("zlib", b""))
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=19, dict_data=zstandard.ZstdCompressionDict(data)).compress(raw), codec
+        c = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, *([data] if data else []))
+        return c.compress(raw) + c.flush(), "zlib"
+
+    def _decompress(self, blob: bytes, codec: str, dict_id: int) -> bytes:
+        data = self._dicts[dict_id][1] if dict_id else b""
+        if codec == "zstd":
+            if zstandard is None: raise RuntimeError("this body needs the zstandard package")
+            return zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(data)).decompress(blob)
+        d = zlib.decompressobj(-15, *([data] if data else []))
+        return d.decompress(blob) + d.flush()
+
+    # ── writing ──
+    def put_body(self, text: str) -> str:
+        """Store `text` once; returns its hash."""
+        h = body_hash(text)
+        if self.db.execute("SELECT 1 FROM bodies WHERE hash=?", (h,)).fetchone(): return h
+        raw = text.encode("utf-8")
+        dict_id = self._current_dict()
+        blob, codec = self._compress(raw, dict_id)
+        self.pack.seek(0, os.SEEK_END)
+        off = self.pack.tell()
+        self.pack.write(blob)
+        self.db.execute("INSERT INTO bodies VALUES (?,?,?,?,?,?)", (h, off, len(blob), len(raw), codec, dict_id))
+        return h
+
+    def put(self, row_data, detail_text) -> bool:
+        """Index one scraped row; False if the row was already stored."""
+        rid = hashlib.blake2b("|".join(row_data).encode("utf-8"), digest_size=12).digest()
+        if self.db.execute("SELECT 1 FROM judgments WHERE rid=?", (rid,)).fetchone(): return False
+        h = self.put_body(detail_text or "")
+        cell = lambda i: row_data[i] if i < len(row_data) else ""
+        self.db.execute("INSERT INTO judgments (rid, case_no, court, judged, doc_id, row_json, hash)"
+                        " VALUES (?,?,?,?,?,?,?)",
+                        (rid, cell(1), cell(2), cell(4), cell(5), json.dumps(row_data, ensure_ascii=False), h))
+        return True
+
+    def commit(self):
+        self.pack.flush()
+        os.fsync(self.pack.fileno())
+        self.db.commit()
+
+    def ingest(self, paths, batch=500) -> int:
+        """Add every new row of the scraper outputs in `paths`; returns how many."""
+        added, buf = 0, []
+        def flush():
+            nonlocal added
+            if not self._dicts and len(buf) >= self.train_min:
+                self.train([r.get("detail_text") or "" for r in buf])
+            added += sum(self.put(r["row_data"], r.get("detail_text", "")) for r in buf)
+            self.commit(); buf.clear()
+        for path in map(Path, paths):
+            for rec in iter_records(path):
+                buf.append(rec)
+                if len(buf) >= batch: flush()
+        flush()
+        return added
+
+    # ── reading ──
+    def body(self, h: str) -> str | None:
+        r = self.db.execute("SELECT off, len, codec, dict FROM bodies WHERE hash=?", (h,)).fetchone()
+        if not r: return None
+        off, n, codec, dict_id = r
+        self.pack.flush()
+        blob = os.pread(self.pack.fileno(), n, off)
+        return self._decompress(blob, codec, dict_id).decode("utf-8")
+
+    def get(self, case_no: str) -> list[dict]:
+        """Every stored judgment with this case number (usually one)."""
+        rows = self.db.execute("SELECT row_json, hash FROM judgments WHERE case_no=?", (case_no,)).fetchall()
+        return [{"row_data": json.loads(rj), "detail_text": self.body(h)} for rj, h in rows]
+
+    def records(self):
+        """All judgments in insertion order, as scraper records."""
+        for rj, h in self.db.execute("SELECT row_json, hash FROM judgments ORDER BY id").fetchall():
+            yield {"row_data": json.loads(rj), "detail_text": self.body(h)}
+
+    def stats(self) -> dict:
+        n_rows = self.db.execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+        n_bodies, raw, packed = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_len),0), COALESCE(SUM(len),0) FROM bodies").fetchone()
+        return {"rows": n_rows, "bodies": n_bodies, "raw_bytes": raw, "packed_bytes": packed,
+                "ratio": raw / packed if packed else 0.0,
+                "codecs": [c for c, _ in self._dicts.values()] or ["zlib"]}
+
+    def close(self):
+        self.commit()
+        self.pack.close()
+        self.db.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--root", default=str(STORE_DIR))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("ingest").add_argument("paths", nargs="*")
+    sub.add_parser("get").add_argument("case_no")
+    sub.add_parser("stats")
+    a = ap.parse_args()
+    with JudgmentStore(a.root) as st:
+        if a.cmd == "ingest":
+            d = Path("Data")
+            n = st.ingest(a.paths or sorted(list(d.glob("*.json")) + list(d.glob("*.jsonl"))))
+            print(f"✓ {n} new judgments stored")
+        elif a.cmd == "get":
+            for rec in st.get(a.case_no): print(rec["detail_text"])
+        else:
+            s = st.stats()
+            print(f"{s['rows']} rows, {s['bodies']} unique bodies, "
+                  f"{s['raw_bytes'] / 2**20:.1f} MiB → {s['packed_bytes'] / 2**20:.1f} MiB "
+                  f"({s['ratio']:.1f}×, {'/'.join(s['codecs'])})")
@@ -1,143 +1,149 @@
 from pathlib import Path
-import json, time, sys
+import sys
 
 from seleniumbase import SB
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import StaleElementReferenceException
 
+from sink import JsonlSink, export_json, row_ids
+from seen_index import SeenIndex, scope_key
+from grid import read_rows, row_key, cell_for
+from scroller import GridScroller
+from tracing import Tracer
+from session import profile_dir, on_form
+
 URL = "https://grpportal.rak.ae/sap/bc/webdynpro/sap/ZWDA_ESERV_JUD_PUBL"
 TABLE_SEL = (By.CSS_SELECTOR, "table[ct='ST']")
 BACK_BTN_XP = "//div[@role='button' and @title='عودة']"
-OUT_FILE = Path("Data/final_output.json")
-OUT_FILE.parent.mkdir(exist_ok=True)
 
-def rows_in_view(sb):
-    """Return a fresh list of visible table rows, skipping the header."""
-    table = sb.find_elements(*TABLE_SEL)[0]
-    return table.find_elements(By.CSS_SELECTOR, "tbody tr[role='row']")[1:]
 
-def last_row_id(row_el):
-    """Generate a unique identifier string from a row's cell contents."""
-    cells = row_el.find_elements(By.TAG_NAME, "td")
-    return "|".join(c.text.strip() for c in cells)
+def scrape(label="", fresh=False, url=URL, headless=False, wait_for_login=True):
+    """Crawl the search picked by hand in the browser; returns the JSON path.
 
-def wait_new_rows(sb, prev_last_id, timeout=4):
-    """
-    Wait until a new row appears at the bottom of the table or timeout occurs.
-    Returns the last row's ID after scrolling.
+    The filters are picked by hand in the browser, so the resume scope is
+    just a label; pass a different one per filter combination.
     """
-    end = time.time() + timeout
-    while time.time() < end:
-        cur_last_id = last_row_id(rows_in_view(sb)[-1])
-        if cur_last_id != prev_last_id:
-            return cur_last_id
-        time.sleep(0.25)
-    return cur_last_id
-
-results: list[dict] = []
-seen_rows: set[str] = set()
-
-with SB(uc=True, headless=False) as sb:
-    sb.uc_open(URL)
-    sb.wait_for_ready_state_complete()
-    input("Please complete login and CAPTCHA, then press Enter...")
-
-    sb.wait_for_element(*TABLE_SEL, timeout=60)
-
-    scroll_round = 0
-    scroll_limit = 100
-    stagnant_hits = 0
-
-    while scroll_round < scroll_limit:
-        rows = rows_in_view(sb)
-        if not rows:
-            print("No rows found. Exiting.")
-            break
-
-        print(f"\nPage {scroll_round}: {len(rows)} visible rows")
-
-        for idx in range(len(rows)):
-            try:
-                rows = rows_in_view(sb)  # Refresh element handles
-                row = rows[idx]
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) < 7:
-                    continue
+    out_file = Path(f"Data/final_output_{label}.json" if label else "Data/final_output.json")
+    out_file.parent.mkdir(exist_ok=True)
+    out_jsonl = out_file.with_suffix(".jsonl")
+
+    seen_rows = SeenIndex(scope_key("main", label))
+    if fresh or not out_jsonl.exists():
+        seen_rows.clear()
+    else:
+        seen_rows.update(row_ids(out_jsonl))
+        print(f"Resuming: {len(seen_rows)} rows already scraped")
+    sink = JsonlSink(out_jsonl, resume=not fresh, on_flush=seen_rows.commit)
+    tried_rows: set[str] = set()
+    tracer = Tracer(out_file.with_suffix(".trace.jsonl"))
+
+    try:
+        # one profile per label keeps its login / CAPTCHA cookies between runs;
+        # concurrent runs with different labels never share a profile
+        with SB(uc=True, headless=headless, user_data_dir=str(profile_dir(label))) as sb:
+            sb.uc_open(url)
+            sb.wait_for_ready_state_complete()
+            timeout = 60
+            if on_form(sb.driver, timeout=5):
+                print("Session still valid, no login needed. Pick the filters and search.")
+                timeout = 600  # time to pick the filters by hand
+            elif wait_for_login:
+                input("Please complete login and CAPTCHA, then press Enter...")
+
+            sb.wait_for_element(*TABLE_SEL, timeout=timeout)
+
+            scroller = GridScroller(sb.driver, tracer)
+            stale_scrolls = 0
+
+            while True:
+                rows = read_rows(sb.driver)  # one round trip for all cell texts
+                if not rows:
+                    print("No rows found. Exiting.")
+                    break
+
+                print(f"\nPage {scroller.rounds}: {len(rows)} visible rows")
+
+                for row_data in rows:
+                    try:
+                        if len(row_data) < 7:
+                            continue
+
+                        row_id = row_key(row_data)
+                        if not row_id or row_id in tried_rows or row_id in seen_rows:
+                            continue
+
+                        # Look the row up again by key: the grid may have re-rendered
+                        detail_btn = cell_for(sb.driver, row_id, 6)
+                        if detail_btn is None:
+                            tracer.count("rerender")
+                            continue
+                        tried_rows.add(row_id)
+
+                        # Scroll to and click the detail button
+                        with tracer.span("detail", row=row_id):
+                            sb.driver.execute_script(
+                                "arguments[0].scrollIntoView({block:'center'});", detail_btn
+                            )
+                            detail_btn.click()
+                            sb.wait_for_element(BACK_BTN_XP, timeout=25)
+
+                            detail_text = sb.driver.find_element(By.TAG_NAME, "body").text
+
+                        with tracer.span("write"):
+                            idx_saved = sink.append(row_data, detail_text)
+                        seen_rows.add(row_id)
+                        tracer.count("rows")
+                        print(f"Saved row #{idx_saved}")
+
+                        with tracer.span("back"):
+                            sb.click(BACK_BTN_XP)
+                            sb.wait_for_element(*TABLE_SEL, timeout=30)
+
+                    except StaleElementReferenceException:
+                        tracer.count("stale")
+                        continue
+                    except Exception as e:
+                        print(f"Row-handling error: {e}")
+                        tracer.count("row_errors")
+                        try:
+                            sb.click(BACK_BTN_XP)
+                        except Exception:
+                            pass
+                        sb.wait_for_element(*TABLE_SEL, timeout=30)
+                        continue
 
-                row_data = [c.text.strip() for c in cells]
-                row_id = "|".join(row_data)
-                if not row_id or row_id in seen_rows:
-                    continue
-                seen_rows.add(row_id)
-
-                # Scroll to and click the detail button
-                sb.driver.execute_script(
-                    "arguments[0].scrollIntoView({block:'center'});", cells[6]
-                )
-                cells[6].click()
-                sb.wait_for_element(BACK_BTN_XP, timeout=25)
-
-                detail_text = sb.driver.find_element(By.TAG_NAME, "body").text
-
-                results.append({
-                    "index": len(results),
-                    "row_data": row_data,
-                    "detail_text": detail_text
-                })
-
-                OUT_FILE.write_text(
-                    json.dumps(results, ensure_ascii=False, indent=2),
-                    encoding="utf-8"
-                )
-                print(f"Saved row #{len(results)-1}")
-
-                sb.click(BACK_BTN_XP)
-                sb.wait_for_element(*TABLE_SEL, timeout=30)
-
-            except StaleElementReferenceException:
-                continue
-            except Exception as e:
-                print(f"Row-handling error: {e}")
                 try:
-                    sb.click(BACK_BTN_XP)
-                except Exception:
-                    pass
-                sb.wait_for_element(*TABLE_SEL, timeout=30)
-                continue
-
-        try:
-            rows = rows_in_view(sb)
-            bottom_before = last_row_id(rows[-1])
-
-            sb.click(
-                "table[ct='ST'] tr[role='row']:nth-last-of-type(2) "
-                "td:nth-child(3)"
-            )
-            act = ActionChains(sb.driver)
-            for _ in range(11):
-                act.send_keys(Keys.ARROW_DOWN)
-            act.perform()
-
-            bottom_after = wait_new_rows(sb, bottom_before)
-
-        except StaleElementReferenceException:
-            continue
-        except Exception as e:
-            print(f"Scrolling error: {e}")
-            break
-
-        if bottom_after == bottom_before:
-            stagnant_hits += 1
-        else:
-            stagnant_hits = 0
-
-        if stagnant_hits >= 2:
-            print("No new rows detected after scrolling. Exiting.")
-            break
-
-        scroll_round += 1
-
-    print(f"\nFinished. Total unique rows scraped: {len(results)}")
-    print(f"Output written to: {OUT_FILE.resolve()}")
+                    # one page per round; ends at the table's last row
+                    if not scroller.advance():
+                        print("No new rows detected after scrolling. Exiting."
+                              if scroller.finished() else "Grid stopped before its last row. Exiting.")
+                        break
+
+                    stale_scrolls = 0
+
+                except StaleElementReferenceException:
+                    stale_scrolls += 1
+                    if stale_scrolls >= 3:
+                        print("Grid keeps re-rendering while scrolling. Exiting.")
+                        break
+                    continue
+                except Exception as e:
+                    print(f"Scrolling error: {e}")
+                    break
+
+            print(f"\nFinished. Total unique rows scraped: {sink.count}")
+    finally:
+        sink.close()
+        seen_rows.close()
+        export_json(out_jsonl, out_file)
+        print(tracer.summary())
+        tracer.write_prometheus(out_file.with_suffix(".prom"))
+        tracer.close()
+    print(f"Output written to: {out_file.resolve()}")
+    return out_file
+
+
+# Usage: python main.py [scope-label] [--fresh]
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--fresh"]
+    scrape(args[0] if args else "", fresh="--fresh" in sys.argv[1:])
@@ -0,0 +1,60 @@
+"""Persistent TTL cache for the portal's dropdown option lists.
+
+Entries are keyed by the list and its parent selection, e.g.
+`("clas", "محكمة أول درجة")`. A fresh entry is served from memory. A
+stale entry is still served immediately while a background thread
+reloads it from the portal (stale-while-revalidate). Only a missing
+entry blocks on the portal.
+"""
+from __future__ import annotations
+import json, os, threading, time
+from pathlib import Path
+
+
+class OptionCache:
+    def __init__(self, path, ttl=24 * 3600):
+        self.path, self.ttl = Path(path), ttl
+        self._mx = threading.Lock()
+        self._refreshing: set[str] = set()
+        try: self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError): self._data = {}
+
+    @staticmethod
+    def _key(key) -> str:
+        return "|".join("" if k is None else str(k) for k in key)
+
+    def get(self, key, loader) -> list[str]:
+        """Options for `key`; `loader()` fetches them from the portal when needed."""
+        k = self._key(key)
+        with self._mx: ent = self._data.get(k)
+        if ent is None:
+            return self._load(k, loader)
+        if time.time() - ent["ts"] > self.ttl:
+            self._refresh_bg(k, loader)
+        return ent["opts"]
+
+    def _load(self, k, loader):
+        opts = list(loader())
+        if opts:                        # an empty list is a failed load, not an answer
+            with self._mx:
+                self._data[k] = {"ts": time.time(), "opts": opts}
+                self._save()
+        return opts
+
+    def _refresh_bg(self, k, loader):
+        with self._mx:
+            if k in self._refreshing: return
+            self._refreshing.add(k)
+        def run():
+            try: self._load(k, loader)
+            except Exception: pass      # keep serving the stale entry
+            finally:
+                with self._mx: self._refreshing.discard(k)
+        threading.Thread(target=run, daemon=True).start()
+
+    def _save(self):
+        # callers hold self._mx
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
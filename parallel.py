@@ -0,0 +1,92 @@
+"""Parallel backfill: one `app.run_scraper` slice per worker process.
+
+The job is split into filter slices (court × classification × type ×
+year). Each slice runs in a process from a bounded pool and owns its own
+headless Chrome from `app.create_driver`. Slice outputs are merged into
+one de-duplicated JSONL/JSON pair at the end.
+
+    python parallel.py --court "محكمة أول درجة" --clas مدني جزائي \\
+        --year 2023 2024 2025 --workers 4 --per-min 30
+"""
+from __future__ import annotations
+import argparse, itertools, os, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+from sink import JsonlSink, export_json, iter_jsonl
+
+DATA_DIR = Path("Data")
+
+
+def make_slices(courts, years, classes=(None,), types=(None,)) -> list[dict]:
+    """Cartesian product of the filter values, as `run_scraper` kwargs."""
+    return [dict(court=c, clas=cl, ctype=t, year=y)
+            for c, cl, t, y in itertools.product(courts, classes or (None,),
+                                                 types or (None,), years)]
+
+
+def _run_slice(job: dict, file_prefix: str, max_per_min) -> str:
+    import app  # imported in the worker so each process owns its selenium state
+    return str(app.run_scraper(**job, file_prefix=file_prefix,
+                               max_per_min=max_per_min, export=False))
+
+
+def merge(jsonl_paths, out_jsonl) -> int:
+    """Concatenate slice outputs, dropping rows already seen in earlier slices."""
+    seen = set()
+    with JsonlSink(out_jsonl) as sink:
+        for p in jsonl_paths:
+            if not Path(p).exists(): continue
+            for rec in iter_jsonl(p):
+                rid = "|".join(rec.get("row_data") or [])
+                if not rid or rid in seen: continue
+                seen.add(rid)
+                sink.append(rec["row_data"], rec["detail_text"])
+        return sink.count
+
+
+def run_parallel(slices, workers=None, max_per_min=None, file_prefix="result"):
+    """Run every slice on at most `workers` processes; returns the merged JSON path."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(slices) or 1))
+    print(f"🧵 {len(slices)} slices on {workers} workers")
+    t0, paths = time.time(), {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as ex:
+        futs = {ex.submit(_run_slice, job, file_prefix, max_per_min): i
+                for i, job in enumerate(slices)}
+        for fut in as_completed(futs):
+            i = futs[fut]
+            try:
+                paths[i] = fut.result()
+                print(f"✅ Slice {i+1}/{len(slices)} done: {slices[i]}")
+            except Exception as e:
+                print(f"❌ Slice {i+1}/{len(slices)} failed: {e}")
+
+    stamp = int(time.time())
+    out_jsonl = DATA_DIR / f"{file_prefix}_merged_{stamp}.jsonl"
+    out_json = out_jsonl.with_suffix(".json")
+    # merge in slice order so the output is deterministic
+    rows = merge([paths[i] for i in sorted(paths)], out_jsonl)
+    export_json(out_jsonl, out_json)
+    dt = max(time.time() - t0, 1e-6)
+    print(f"🎉 {rows} unique rows in {dt:.0f}s ({rows / dt * 60:.1f} rows/min) → {out_json.resolve()}")
+    return out_json
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--court", nargs="+", required=True)
+    ap.add_argument("--year", nargs="+", required=True)
+    ap.add_argument("--clas", nargs="*", default=None)
+    ap.add_argument("--ctype", nargs="*", default=None)
+    ap.add_argument("--workers", type=int, default=None, help="max concurrent browsers")
+    ap.add_argument("--per-min", type=float, default=None, help="max detail pages per minute, per worker")
+    ap.add_argument("--prefix", default="result")
+    ap.add_argument("--incremental", action="store_true", help="only rows judged since the last full run")
+    ap.add_argument("--recycle-rows", type=int, default=2000, help="restart Chrome every N rows")
+    ap.add_argument("--max-rss-mb", type=float, default=None, help="restart Chrome above this RSS (psutil or /proc)")
+    a = ap.parse_args()
+    slices = make_slices(a.court, a.year, a.clas, a.ctype)
+    for job in slices:
+        job.update(incremental=a.incremental, recycle_rows=a.recycle_rows, max_rss_mb=a.max_rss_mb)
+    run_parallel(slices, workers=a.workers, max_per_min=a.per_min, file_prefix=a.prefix)
@@ -1,9 +1,7 @@
 from __future__ import annotations
-import os, time, threading, atexit, sys, re, unicodedata
-from io import StringIO
+import os, time, atexit, sys
 from pathlib import Path
 import pandas as pd, gradio as gr
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -11,18 +9,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import *
 
-# ── helpers ─────────────────────────────────────────────────────
-DIGIT_MAP = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
-def normalize(txt: str) -> str:
-    txt = txt.replace("\u200e","").replace("\u200f","").translate(DIGIT_MAP)
-    txt = re.sub(r"\s+", " ", txt).strip()
-    parts = txt.split()
-    if len(parts) > 1 and all(len(p) == 1 for p in parts):
-        txt = "".join(parts)
-    return txt
-
-def has_arabic(s): return any("ARABIC" in unicodedata.name(ch,"") for ch in s)
+from textnorm import normalize
+from driver_pool import DriverPool
+from waits import wait_for, wait_idle, wait_listbox, wait_quiet
+from option_cache import OptionCache
+from frames import FrameLocator
+from grid import read_table
+from scroller import GridScroller
+from grid_parse import rows_to_df
+from result_cache import ResultCache
+from lean import lean_options, apply_lean
+from tracing import Tracer
+import search_index
+from session import CookieJar, attach, attach_address
 
+# ── helpers ─────────────────────────────────────────────────────
 def log(m,* ,ok=False,warn=False,err=False):
     if sys.stdout.isatty():
         c="\033[92m"if ok else"\033[93m"if warn else"\033[91m"if err else"\033[96m"
@@ -30,7 +31,7 @@ def log(m,* ,ok=False,warn=False,err=False):
     else: print(m)
 
 # ── constants ───────────────────────────────────────────────────
-URL="https://grpportal.rak.ae/irj/portal/judgement_publications"
+URL=os.environ.get("RAK_URL","https://grpportal.rak.ae/irj/portal/judgement_publications")
 SEL=dict(
     court='input[data-hint*="ZDE_COURT_TYPE"]',
     clas ='input[data-hint*="ZDE_COURT_CLASSIFY_TYPE"]',
@@ -42,190 +43,254 @@ SEL=dict(
     busy  ='div[id^="urBusyIndicator"]')
 DATA_DIR="Data"; Path(DATA_DIR).mkdir(exist_ok=True)
 
-# ── WebDriver (headless) ───────────────────────────────────────
-opt=webdriver.ChromeOptions()
-opt.add_argument("--headless=new")
-opt.add_argument("--disable-gpu"); opt.add_argument("--no-sandbox")
-opt.add_argument("--window-size=1920,1080")
-drv=webdriver.Chrome(options=opt)
-wait=WebDriverWait(drv,25)
-atexit.register(drv.quit)
-lock=threading.Lock()
+# ── tracing: RAK_TRACE=path.jsonl writes spans; summary printed at exit ──
+tracer=Tracer(os.environ.get("RAK_TRACE"))
+def _trace_report():
+    print(tracer.summary())
+    if tracer.path: tracer.write_prometheus(tracer.path.with_suffix(".prom"))
+    tracer.close()
+atexit.register(_trace_report)
+
+# ── WebDriver pool (headless) ──────────────────────────────────
+DEBUGGER=attach_address()                   # warm `session.py daemon` to attach to
+POOL_SIZE=1 if DEBUGGER else int(os.environ.get("RAK_POOL_SIZE","3"))
+LEAN=os.environ.get("RAK_LEAN","0")=="1"   # block images/fonts/trackers, see lean.py
+
+def new_driver():
+    if DEBUGGER:
+        drv=attach(DEBUGGER,URL)
+        if LEAN: apply_lean(drv)
+        return drv
+    opt=webdriver.ChromeOptions()
+    opt.add_argument("--headless=new")
+    opt.add_argument("--disable-gpu"); opt.add_argument("--no-sandbox")
+    opt.add_argument("--window-size=1920,1080")
+    if LEAN: lean_options(opt)
+    drv=webdriver.Chrome(options=opt)
+    if LEAN: apply_lean(drv)
+    CookieJar().load(drv)
+    return drv
+
+def wait(drv): return WebDriverWait(drv,25)
 
 # ── frame utilities ────────────────────────────────────────────
-def dfs(css):
-    try: drv.find_element(By.CSS_SELECTOR,css); return True
-    except NoSuchElementException:
-        for fr in drv.find_elements(By.TAG_NAME,"iframe"):
-            drv.switch_to.frame(fr)
-            if dfs(css): return True
-            drv.switch_to.parent_frame()
-    return False
-
-def enter_form():
+GRID_PATH = [1, 0, 0]       # root → iframe[1] → iframe[0] → inline srcdoc iframe
+FORM_PROBE = (By.CSS_SELECTOR,SEL["court"])
+GRID_PROBE = (By.CSS_SELECTOR,"table[ct='ST']")
+# learned frame paths are shared by every pooled driver and kept across restarts
+frames=FrameLocator(Path(DATA_DIR)/"frame_paths.json",seed={"grid":GRID_PATH})
+
+def enter_form(drv):
     deadline=time.time()+40
     while time.time()<deadline:
-        drv.switch_to.default_content()
-        if dfs(SEL["court"]):
+        if frames.enter(drv,"form",FORM_PROBE):
             log("✓ داخل الإطار", ok=True); return
         time.sleep(1)
     raise RuntimeError("iframe النموذج غير موجود")
 
-def idle():
-    try: wait.until(
-        EC.invisibility_of_element_located((By.CSS_SELECTOR,SEL["busy"])))
-    except TimeoutException: pass
+def in_form(drv):
+    """Pool health probe: make sure the driver is parked on the form."""
+    if not drv.find_elements(By.CSS_SELECTOR,SEL["court"]): enter_form(drv)
+
+def idle(drv):
+    with tracer.span("idle"):
+        if not wait_idle(drv,25,SEL["busy"]): tracer.count("idle_timeouts")
+
+def open_portal(drv):
+    if frames.enter(drv,"form",FORM_PROBE):     # attached to a tab already on the form
+        log("✓ جلسة جاهزة", ok=True); return
+    drv.get(URL); log("landing page")
+    enter_form(drv)
+    CookieJar().save(drv)
+
+pool=DriverPool(new_driver,POOL_SIZE,prepare=open_portal,check=in_form)
+atexit.register(pool.close)
 
 # ── combo box helpers ──────────────────────────────────────────
-def current(css):
+def current(drv,css):
     try: return normalize(drv.find_element(By.CSS_SELECTOR,css).get_attribute("value"))
     except NoSuchElementException: return ""
 
-def open_list(box):
-    box.click(); time.sleep(0.25)
-    if not drv.find_elements(By.CSS_SELECTOR,"div.lsListbox__value[role='option']"):
+def open_list(drv,box):
+    box.click()
+    if not wait_listbox(drv,0.25,"div.lsListbox__value[role='option']"):
         box.send_keys(Keys.ARROW_DOWN)
 
-def set_combo(css,val,label):
+def set_combo(drv,css,val,label):
     if not val: return
     val = normalize(val)
-    if current(css)==val:
+    if current(drv,css)==val:
         log(f"↷ {label} = {val} (no change)"); return
     for k in range(4):
         try:
-            idle()
-            box=drv.find_element(By.CSS_SELECTOR,css)
-            drv.execute_script("arguments[0].removeAttribute('readonly')",box)
-            open_list(box)
-            opt=wait.until(EC.element_to_be_clickable(
-                (By.XPATH,f"//div[@ct='LIB_I' and normalize-space()='{val}']")))
-            opt.click(); log(f"✓ {label} ← {val}",ok=True)
-            if css==SEL["court"]: time.sleep(0.8)
+            with tracer.span("set_combo",field=label):
+                idle(drv)
+                box=drv.find_element(By.CSS_SELECTOR,css)
+                drv.execute_script("arguments[0].removeAttribute('readonly')",box)
+                open_list(drv,box)
+                opt=wait(drv).until(EC.element_to_be_clickable(
+                    (By.XPATH,f"//div[@ct='LIB_I' and normalize-space()='{val}']")))
+                opt.click(); log(f"✓ {label} ← {val}",ok=True)
+                if css==SEL["court"]: wait_quiet(drv,0.15,0.8)   # dependent lists reload
             return
         except Exception:
-            log(f"retry {k+1}/4 {label}",warn=True); time.sleep(0.6)
+            tracer.count("set_combo_retries")
+            log(f"retry {k+1}/4 {label}",warn=True); wait_quiet(drv,0.15,0.6)
     raise RuntimeError(f"لا يمكن اختيار {label}")
 
-def list_opts(css,label):
-    idle(); box=drv.find_element(By.CSS_SELECTOR,css)
+def list_opts(drv,css,label):
+    idle(drv); box=drv.find_element(By.CSS_SELECTOR,css)
     drv.execute_script("arguments[0].removeAttribute('readonly')",box)
-    open_list(box)
-    items=wait.until(EC.presence_of_all_elements_located(
+    open_list(drv,box)
+    items=wait(drv).until(EC.presence_of_all_elements_located(
         (By.CSS_SELECTOR,"div.lsListbox__value[role='option']")))
     names=[normalize(i.text) for i in items if normalize(i.text)]
     box.send_keys(Keys.ESCAPE)
     log(f"✓ {label} options ({len(names)})",ok=True); return names
 
-# ── fixed-path grid helpers ─────────────────────────────────────
-GRID_PATH = [1, 0]          # root → iframe[1] → iframe[0]
-
-def switch_to_grid_frame():
-    drv.switch_to.default_content()
-    for idx in GRID_PATH:
-        frames = drv.find_elements(By.TAG_NAME, "iframe")
-        if idx >= len(frames):
-            raise RuntimeError("تغيّر هيكل الإطارات")
-        drv.switch_to.frame(frames[idx])
-    # last hop: the inline <iframe srcdoc="..."> created by Web-Dynpro
-    inner = drv.find_elements(By.TAG_NAME, "iframe")
-    if inner:
-        drv.switch_to.frame(inner[0])
-
-def wait_grid_df(timeout=15) -> pd.DataFrame|None:
-    switch_to_grid_frame()
+# ── grid helpers (memoised frame path) ──────────────────────────
+def switch_to_grid_frame(drv,search=True) -> bool:
+    return frames.enter(drv,"grid",GRID_PROBE,search)
+
+GRID_FILLED_JS = ("Array.from(document.querySelectorAll(\"table[ct='ST'] tbody tr[role='row']\"))"
+                  ".slice(1).some(r => r.innerText.trim())")
+
+def wait_grid_df(drv,timeout=15) -> pd.DataFrame|None:
     deadline = time.time() + timeout
-    headers  = ("رقم القضية", "Case/File No.")
+    in_grid, k = False, 0
     while time.time() < deadline:
-        html = drv.page_source
-        if any(h in html for h in headers):
-            df = pick_table(html)
-            if df is not None and not df.empty:
-                return df
-        time.sleep(0.5)
+        # until the grid renders, re-check the learned path (cheap) each round
+        # and only walk every iframe now and then, in case the layout moved
+        in_grid = in_grid or switch_to_grid_frame(drv,search=k%4==3)
+        k += 1
+        if not in_grid:
+            time.sleep(0.5); continue
+        df = rows_to_df(read_table(drv))      # one round trip, no page_source
+        if df is not None and not df.empty:
+            return df
+        wait_for(drv,GRID_FILLED_JS,timeout=0.5)
     return None
 
-# ── table picker (header-based) ─────────────────────────────────
-def pick_table(html)->pd.DataFrame|None:
-    soup=BeautifulSoup(html,"lxml")
-    hdr_tbl=soup.select_one(
-        "table:has(td:contains('رقم القضية'), th:contains('رقم القضية'))")
-    if hdr_tbl:
-        return pd.read_html(StringIO(str(hdr_tbl)),flavor="lxml")[0]
-    for tbl in soup.select("table"):
-        hdr=" ".join(td.get_text() for td in tbl.find("tr").find_all(["td","th"]))
-        if has_arabic(hdr) and len(tbl.find_all("tr"))>=3:
-            return pd.read_html(StringIO(str(tbl)),flavor="lxml")[0]
-    return None
+# ── cached dropdown lists ──────────────────────────────────────
+OPT_TTL=float(os.environ.get("RAK_OPT_TTL",24*3600))
+opt_cache=OptionCache(Path(DATA_DIR)/"options_cache.json",OPT_TTL)
+OPT_LABEL=dict(court="درجة القضاء",clas="التصنيف",ctype="النوع",year="السنة")
 
-# ── NEW: crawl every iframe for the first non-empty table ───────
-def crawl_for_df() -> pd.DataFrame|None:
-    def _dfs() -> pd.DataFrame|None:
-        df = pick_table(drv.page_source)
-        if df is not None and not df.empty:
-            return df
-        for fr in drv.find_elements(By.TAG_NAME,"iframe"):
-            drv.switch_to.frame(fr)
-            try:
-                found = _dfs()
-                if found is not None and not found.empty:
-                    return found
-            finally:
-                drv.switch_to.parent_frame()
-        return None
-    return _dfs()
-
-# ── initialise page & dropdown lists ───────────────────────────
-with lock:
-    drv.get(URL); log("landing page")
-    enter_form()
-    DEG=list_opts(SEL["court"],"درجة القضاء")
-    YRS=list_opts(SEL["year" ],"السنة")
+def options(kind,deg=None,cls=None):
+    """Option list for `kind` under the parent selection; portal only on miss/stale."""
+    deg,cls=(normalize(v) if v else None for v in (deg,cls))
+    def load():
+        with pool.driver() as drv:
+            set_combo(drv,SEL["court"],deg,"درجة"); set_combo(drv,SEL["clas"],cls,"التصنيف")
+            return list_opts(drv,SEL[kind],OPT_LABEL[kind])
+    return opt_cache.get((kind,deg,cls),load)
+
+# ── initialise dropdown lists ──────────────────────────────────
+DEG=options("court")
+YRS=options("year")
+pool.warm()                      # drivers load in the background
 
-last_df:pd.DataFrame|None=None
 def norm(x): return None if x in ("",None,"None") else x
 
 # ── Gradio callbacks ───────────────────────────────────────────
+# Each callback borrows a driver from the pool and may get a different one
+# than the previous callback, so combos are always (re)set explicitly.
 def cb_cls(d):
     if not d: return gr.Dropdown()
-    with lock:
-        set_combo(SEL["court"],d,"درجة")
-        return gr.Dropdown(choices=list_opts(SEL["clas"],"التصنيف"))
+    return gr.Dropdown(choices=options("clas",d))
 
 def cb_typ(d,c):
     if not (d and c): return gr.Dropdown()
-    with lock:
-        set_combo(SEL["court"],d,"درجة"); set_combo(SEL["clas"],c,"التصنيف")
-        return gr.Dropdown(choices=list_opts(SEL["ctype"],"النوع"))
+    return gr.Dropdown(choices=options("ctype",d,c))
 
-def do_search(deg,cls,typ,yr,num):
-    global last_df
+def reset_if_dirty(drv,vals):
+    """Clear the form if a filter left empty still holds a previous user's value."""
+    if any(not v and current(drv,SEL[k]) for k,v in vals.items()):
+        drv.find_element(By.CSS_SELECTOR,SEL["clear"]).click(); idle(drv)
+        enter_form(drv)
+
+# ── search result cache ────────────────────────────────────────
+results=ResultCache(int(os.environ.get("RAK_CACHE_SIZE","64")),
+                    float(os.environ.get("RAK_CACHE_TTL",3600)),
+                    Path(DATA_DIR)/"result_cache")
+
+def search_key(deg,cls,typ,yr,num):
+    return tuple(normalize(v) if v else "" for v in (deg,cls,typ,yr,num))
+
+def do_search(deg,cls,typ,yr,num,force=False):
+    """Generator: yields (last_df, msg, fname, save_b, save_m, cache_m, res_df)
+    each time more rows have been read off the grid."""
     deg,cls,typ,yr = map(norm,(deg,cls,typ,yr))
-    with lock:
-        try:
-            log(f"--- بحث {deg=} {cls=} {typ=} {yr=} {num=}")
-            enter_form()
-            set_combo(SEL["court"],deg,"درجة")
-            set_combo(SEL["clas"], cls,"التصنيف")
-            set_combo(SEL["ctype"],typ,"النوع")
-            set_combo(SEL["year"], yr,"السنة")
-            b=drv.find_element(By.CSS_SELECTOR,SEL["num"]); b.clear()
-            if num: b.send_keys(num)
-            drv.find_element(By.CSS_SELECTOR,SEL["search"]).click(); idle()
-
-            df = wait_grid_df()        # ← NEW: exact-frame wait
-            if df is None:
-                last_df=None
-                return "لا توجد بيانات", gr.update(visible=False), gr.update(visible=False), ""
-
-            if df.iloc[:,0].astype(str).str.strip().eq("").all():
-                df = df.iloc[:,1:]
-            last_df = df
-            return f"عُثر على {len(df)} صفوف.", gr.update(visible=True), gr.update(visible=True), ""
-        except Exception as e:
-            last_df=None
-            return f"⚠ {e}", gr.update(visible=False), gr.update(visible=False), ""
-        
-def save_json(name):
+    key=search_key(deg,cls,typ,yr,num)
+    hide,show=gr.update(visible=False),gr.update(visible=True)
+    try:
+        df = None if force else results.get(key)
+        if df is not None:
+            tracer.count("cache_hits")
+            log(f"↷ cache hit {key} ({results.stats()})",ok=True)
+            yield df, f"عُثر على {len(df)} صفوف (من الذاكرة المؤقتة).", show, show, "", results.stats(), df
+            return
+        status={}
+        with tracer.span("search",key="|".join(key)):
+            for df in fetch_rows(deg,cls,typ,yr,num,status):
+                yield df, f"⏳ {len(df)} صفوف حتى الآن…", hide, hide, "", results.stats(), df
+        if df is None:
+            yield None, "لا توجد بيانات", hide, hide, "", results.stats(), None
+            return
+        tracer.count("rows",len(df))
+        if not status.get("complete",True):      # grid stopped early: show it, never cache it
+            yield df, f"⚠ توقف الجدول قبل آخر صف – النتائج جزئية ({len(df)} صفوف).", show, show, "", results.stats(), df
+            return
+        results.put(key,df)
+        yield df, f"عُثر على {len(df)} صفوف.", show, show, "", results.stats(), df
+    except Exception as e:
+        yield None, f"⚠ {e}", hide, hide, "", results.stats(), None
+
+def fetch_rows(deg,cls,typ,yr,num,status=None):
+    """Run the search on the live portal; yields the growing result DataFrame
+    after the first screen and after every scroll that brought new rows.
+    `status["complete"]` tells whether the grid was read down to its last row."""
+    status = {} if status is None else status
+    with pool.driver() as drv:
+        log(f"--- بحث {deg=} {cls=} {typ=} {yr=} {num=}")
+        enter_form(drv)
+        reset_if_dirty(drv,dict(court=deg,clas=cls,ctype=typ,year=yr))
+        set_combo(drv,SEL["court"],deg,"درجة")
+        set_combo(drv,SEL["clas"], cls,"التصنيف")
+        set_combo(drv,SEL["ctype"],typ,"النوع")
+        set_combo(drv,SEL["year"], yr,"السنة")
+        b=drv.find_element(By.CSS_SELECTOR,SEL["num"]); b.clear()
+        if num: b.send_keys(num)
+        drv.find_element(By.CSS_SELECTOR,SEL["search"]).click(); idle(drv)
+
+        with tracer.span("grid_wait"): first = wait_grid_df(drv)     # exact-frame wait
+        if first is None:
+            enter_form(drv); return
+        cols, seen, rows = list(first.columns), set(), []
+        def take(df):
+            new = 0
+            for r in df.itertuples(index=False):
+                if r not in seen: seen.add(r); rows.append(list(r)); new += 1
+            return new
+        take(first)
+        yield tidy(pd.DataFrame(rows,columns=cols))
+
+        # page through the virtualised grid down to its last row
+        scroller = GridScroller(drv,tracer)
+        while scroller.advance():
+            df = rows_to_df(read_table(drv))
+            if df is not None and list(df.columns) == cols and take(df):
+                yield tidy(pd.DataFrame(rows,columns=cols))
+        status["complete"]=scroller.finished()
+        if not status["complete"]: log("⚠ grid stopped before its last row",warn=True)
+        enter_form(drv)            # park on the form again before check-in
+
+def tidy(df):
+    if df.iloc[:,0].astype(str).str.strip().eq("").all():
+        df = df.iloc[:,1:]
+    return df
+
+def save_json(last_df,name):
     if last_df is None: return "لا توجد بيانات للحفظ."
     if not name: return "أدخل اسم الملف."
     path=Path(DATA_DIR)/f"{name}.json"
@@ -234,38 +299,78 @@ def save_json(name):
     log(f"✓ saved {path}",ok=True)
     return f"✓ تم الحفظ إلى {path}"
 
-def clear_all():
-    global last_df
-    with lock:
-        try: drv.find_element(By.CSS_SELECTOR,SEL["clear"]).click()
-        except NoSuchElementException: pass
-        enter_form(); last_df=None
-    return None,None,None,None,"",gr.update(visible=False),gr.update(visible=False),""
+# ── local full-text search (no browser) ────────────────────────
+SEARCH_COLS=["رقم القضية","المحكمة","تاريخ القيد","تاريخ الحكم","رقم الوثيقة","مقتطف"]
+
+def local_search(q):
+    if not (q or "").strip(): return pd.DataFrame(columns=SEARCH_COLS), "", []
+    t0=time.perf_counter()
+    hits=search_index.search(q,100)
+    df=pd.DataFrame([[v for k,v in h.items() if k!="id"] for h in hits],columns=SEARCH_COLS)
+    # row ids ride along in a State (gr.Dataframe has no hidden columns)
+    return df, f"{len(hits)} نتيجة في {(time.perf_counter()-t0)*1e3:.0f} ms", [h["id"] for h in hits]
+
+def show_detail(ids,evt:gr.SelectData):
+    """Full judgment text of the clicked search result."""
+    i=evt.index[0]
+    if not ids or i>=len(ids): return ""
+    return search_index.get_detail(ids[i]) or ""
+
+def reindex():
+    n=search_index.ingest(search_index.data_files(DATA_DIR))
+    log(f"✓ indexed {n} new judgments",ok=True)
+    return f"✓ أُضيف {n} حكمًا إلى الفهرس"
 
-# ── UI (unchanged) ─────────────────────────────────────────────
+# ── UI ─────────────────────────────────────────────────────────
 with gr.Blocks(title="سـاحـة الأحكام") as demo:
-    gr.Markdown("### استعلام أحكام دائرة محاكم رأس الخيمة")
-    with gr.Row():
-        deg=gr.Dropdown(label="درجة",choices=DEG,interactive=True)
-        cls=gr.Dropdown(label="التصنيف",interactive=True)
-        typ=gr.Dropdown(label="النوع",interactive=True)
-    with gr.Row():
-        yr =gr.Dropdown(label="السنة",choices=YRS,interactive=True)
-        num=gr.Textbox(label="رقم القضية",lines=1)
-    msg   =gr.Markdown()
-    fname =gr.Textbox(label="اسم ملف JSON",visible=False)
-    save_b=gr.Button("حفظ",visible=False)
-    save_m=gr.Markdown()
-
-    deg.change(cb_cls, inputs=deg, outputs=cls)
-    cls.change(cb_typ, inputs=[deg,cls], outputs=typ)
-
-    gr.Button("بحث").click(do_search,
-        inputs=[deg,cls,typ,yr,num],
-        outputs=[msg,fname,save_b,save_m])
-    save_b.click(save_json, fname, save_m)
-    gr.Button("مسح").click(clear_all,
-        outputs=[deg,cls,typ,yr,num,msg,fname,save_b,save_m])
+    with gr.Tab("استعلام البوابة"):
+        gr.Markdown("### استعلام أحكام دائرة محاكم رأس الخيمة")
+        with gr.Row():
+            deg=gr.Dropdown(label="درجة",choices=DEG,interactive=True)
+            cls=gr.Dropdown(label="التصنيف",interactive=True)
+            typ=gr.Dropdown(label="النوع",interactive=True)
+        with gr.Row():
+            yr =gr.Dropdown(label="السنة",choices=YRS,interactive=True)
+            num=gr.Textbox(label="رقم القضية",lines=1)
+        force =gr.Checkbox(label="تحديث إجباري (تجاوز الذاكرة المؤقتة)",value=False)
+        msg   =gr.Markdown()
+        cache_m=gr.Markdown()
+        fname =gr.Textbox(label="اسم ملف JSON",visible=False)
+        save_b=gr.Button("حفظ",visible=False)
+        save_m=gr.Markdown()
+        res_df=gr.Dataframe(label="النتائج",wrap=True)
+        last_df=gr.State(None)           # per-session result, not shared between users
+
+        deg.change(cb_cls, inputs=deg, outputs=cls)
+        cls.change(cb_typ, inputs=[deg,cls], outputs=typ)
+
+        gr.Button("بحث").click(do_search,
+            inputs=[deg,cls,typ,yr,num,force],
+            outputs=[last_df,msg,fname,save_b,save_m,cache_m,res_df])
+        save_b.click(save_json, [last_df,fname], save_m)
+        # (output, value after "مسح") kept in pairs so values and outputs cannot drift apart;
+        # pooled drivers are reset by the next search (reset_if_dirty), only the UI is cleared
+        cleared=[(last_df,None),(deg,None),(cls,None),(typ,None),(yr,None),(num,""),(msg,""),
+                 (fname,gr.update(visible=False)),(save_b,gr.update(visible=False)),(save_m,""),(res_df,None)]
+        gr.Button("مسح").click(lambda:[v for _,v in cleared], outputs=[c for c,_ in cleared])
+
+    with gr.Tab("بحث في الأحكام المحفوظة"):
+        with gr.Row():
+            q_box=gr.Textbox(label="نص البحث",lines=1,scale=4)
+            q_btn=gr.Button("بحث",scale=1)
+        q_msg=gr.Markdown()
+        q_out=gr.Dataframe(headers=SEARCH_COLS,wrap=True)
+        q_ids=gr.State([])
+        q_txt=gr.Textbox(label="نص الحكم",lines=12,interactive=False)
+        idx_b=gr.Button("تحديث الفهرس من ملفات Data")
+        idx_m=gr.Markdown()
+
+        # index lookups are cheap and never use a driver: no pool-sized limit
+        q_btn.click(local_search,q_box,[q_out,q_msg,q_ids],concurrency_limit=None)
+        q_box.submit(local_search,q_box,[q_out,q_msg,q_ids],concurrency_limit=None)
+        q_out.select(show_detail,q_ids,q_txt,concurrency_limit=None)
+        idx_b.click(reindex,outputs=idx_m)
 
 if __name__=="__main__":
-    demo.launch()
\ No newline at end of file
+    # one queued event per pooled driver → concurrent searches
+    demo.queue(default_concurrency_limit=POOL_SIZE).launch()
@@ -0,0 +1,86 @@
+"""Bounded LRU + TTL cache for search results, with an optional disk tier.
+
+Keys are the normalised filter tuple of a search. The memory tier holds
+at most `maxsize` DataFrames and evicts the least recently used one. An
+entry older than `ttl` seconds is treated as a miss. With `disk_dir`
+set, results are also pickled there and survive restarts. The disk tier
+is pruned to `disk_max` files, oldest first.
+"""
+from __future__ import annotations
+import hashlib, os, tempfile, threading, time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+
+class ResultCache:
+    def __init__(self, maxsize=64, ttl=3600, disk_dir=None, disk_max=500):
+        self.maxsize, self.ttl, self.disk_max = maxsize, ttl, disk_max
+        self.disk = Path(disk_dir) if disk_dir else None
+        if self.disk: self.disk.mkdir(parents=True, exist_ok=True)
+        self._mem: OrderedDict = OrderedDict()
+        self._mx = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _file(self, key) -> Path:
+        return self.disk / (hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".pkl")
+
+    def get(self, key) -> pd.DataFrame | None:
+        now = time.time()
+        with self._mx:
+            ent = self._mem.get(key)
+            if ent and now - ent[0] <= self.ttl:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return ent[1]
+            self._mem.pop(key, None)
+        df, ts = self._disk_get(key, now)
+        with self._mx:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, df, ts)
+        return df
+
+    def _disk_get(self, key, now):
+        """(DataFrame, mtime) from the disk tier, or (None, 0); unreadable files are dropped."""
+        if not self.disk: return None, 0
+        f = self._file(key)
+        try:
+            ts = f.stat().st_mtime
+            if now - ts > self.ttl:
+                f.unlink(missing_ok=True); return None, 0
+            return pd.read_pickle(f), ts
+        except FileNotFoundError:
+            return None, 0
+        except Exception:           # truncated or corrupt pickle (UnpicklingError, EOFError, …)
+            f.unlink(missing_ok=True)
+            return None, 0
+
+    def put(self, key, df: pd.DataFrame):
+        self._remember(key, df, time.time())
+        if self.disk:
+            # write aside and rename, so readers never see a half-written pickle
+            fd, tmp = tempfile.mkstemp(dir=self.disk, suffix=".tmp")
+            os.close(fd)
+            try:
+                df.to_pickle(tmp)
+                os.replace(tmp, self._file(key))
+            finally:
+                if os.path.exists(tmp): os.unlink(tmp)
+            files = sorted(self.disk.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+            for f in files[:max(0, len(files) - self.disk_max)]:
+                f.unlink(missing_ok=True)
+
+    def _remember(self, key, df, ts):
+        with self._mx:
+            self._mem[key] = (ts, df)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        return f"hits {self.hits} / misses {self.misses}" + (f" ({self.hits / total:.0%})" if total else "")
@@ -0,0 +1,147 @@
+"""Page-wise scrolling of the virtualised Web Dynpro grid.
+
+The scrapers used to focus the second-to-last row, press ARROW_DOWN
+eleven times, wait up to 4 s and stop after two stagnant rounds or 100
+rounds. `GridScroller.advance` moves a whole page per round instead:
+
+* PAGE_DOWN from the second-to-last visible row, which leaves one row
+  of overlap. If the table ignores PAGE_DOWN, it falls back to
+  ARROW_DOWN × (visible rows − 2).
+* The table's own row count (`aria-rowcount`, matched against the rows'
+  `aria-rowindex`) tells when the last row is on screen, so a lagging
+  portal is waited out instead of being taken for the end.
+* Waits are sized from an EWMA of how long the grid has actually taken
+  to re-render, and grow while the grid is stuck.
+* A page jump that lost contact with the previous page (no overlap) is
+  walked back and the scroller switches to arrow steps, so no row is
+  skipped.
+
+`advance` only returns True when the grid now shows a row it had never
+shown before; rounds without one use up a fixed budget. Rows are
+finite, so a crawl always ends, with no cap on the number of rounds.
+"""
+from __future__ import annotations
+import time
+from contextlib import nullcontext
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+from grid import _JS_PRELUDE, wait_new_rows
+
+_STATE_JS = _JS_PRELUDE + r"""
+const idx = r => +(r.getAttribute("aria-rowindex") || 0);
+const holder = tbl && (tbl.hasAttribute("aria-rowcount") ? tbl : tbl.closest("[aria-rowcount]"));
+return {keys: rows.map(keyOf), first: rows.length ? idx(rows[0]) : 0,
+        last: rows.length ? idx(rows[rows.length - 1]) : 0,
+        total: holder ? +holder.getAttribute("aria-rowcount") || 0 : 0};
+"""
+
+_FOCUS_JS = _JS_PRELUDE + """
+const at = arguments[1] < 0 ? rows.length + arguments[1] : arguments[1];
+const r = rows[at] || rows[rows.length - 1];
+if (!r) return null;
+r.scrollIntoView({block: "center"});
+const c = r.querySelectorAll("td");
+return c[Math.min(arguments[0], c.length - 1)] || null;
+"""
+
+
+class GridScroller:
+    def __init__(self, driver, tracer=None, focus_col=2, patience=4, alpha=0.3, beat=None):
+        self.driver, self.tracer = driver, tracer
+        self.beat = beat or (lambda: None)  # called after every wait, e.g. a watchdog heartbeat
+        self.focus_col, self.patience, self.alpha = focus_col, patience, alpha
+        self.mode = "page"                  # → "arrows" if PAGE_DOWN does nothing or skips rows
+        self.ewma = None                    # seconds from key press to re-rendered grid
+        self.rounds = self.stagnant = self._idle = 0
+        self.seen: set[str] = set()
+
+    # ── observations ──
+    def state(self) -> dict:
+        s = self.driver.execute_script(_STATE_JS) or {"keys": [], "first": 0, "last": 0, "total": 0}
+        s["bottom"] = s["keys"][-1] if s["keys"] else ""
+        return s
+
+    def at_end(self, s=None) -> bool:
+        """True only when the table's own row count says the last row is visible.
+        aria-rowcount="-1" (or missing) means the count is unknown."""
+        s = s or self.state()
+        return bool(s["total"] > 0 and s["last"] and s["last"] >= s["total"])
+
+    def finished(self) -> bool:
+        """After `advance` returned False: end of data (True) or a stuck grid?
+        No visible rows is always stuck; without a row count a grid that
+        stopped growing counts as the end."""
+        s = self.state()
+        if not s["keys"]: return False
+        return self.at_end(s) or s["total"] <= 0
+
+    def timeout(self, attempt=0) -> float:
+        base = 4.0 if self.ewma is None else min(max(3 * self.ewma + 0.3, 0.5), 20.0)
+        return base * (1 + attempt)
+
+    def _observe(self, secs):
+        self.ewma = secs if self.ewma is None else self.alpha * secs + (1 - self.alpha) * self.ewma
+
+    def _count(self, name):
+        if self.tracer: self.tracer.count(name)
+
+    # ── actions ──
+    def _press(self, s, key=None, times=None, row=-2):
+        cell = self.driver.execute_script(_FOCUS_JS, self.focus_col, row)
+        if cell is not None: cell.click()
+        if key is None:
+            key = Keys.PAGE_DOWN if self.mode == "page" else Keys.ARROW_DOWN
+            times = 1 if self.mode == "page" else max(1, len(s["keys"]) - 2)
+        ActionChains(self.driver).send_keys(key * times).perform()
+
+    def _wait(self, bottom, attempt):
+        t0 = time.perf_counter()
+        with self.tracer.span("wait_new_rows") if self.tracer else nullcontext():
+            new = wait_new_rows(self.driver, bottom, timeout=self.timeout(attempt))
+        self.beat()
+        if new != bottom: self._observe(time.perf_counter() - t0)
+        return new
+
+    def advance(self) -> bool:
+        """Move one page down; False once the end is reached (or the grid stays stuck)."""
+        s = self.state()
+        self.seen.update(s["keys"])
+        while s["keys"] and not self.at_end(s) and self._idle < self.patience:
+            self.rounds += 1
+            with self.tracer.span("scroll", page=self.rounds, mode=self.mode) if self.tracer else nullcontext():
+                if not self._advance(s): return False
+            s = self.state()
+            fresh = set(s["keys"]) - self.seen
+            self.seen.update(fresh)
+            if fresh: self._idle = 0; return True
+            self._idle += 1                 # moved, but only onto rows already shown
+        return False
+
+    def _advance(self, s):
+        bottom = s["bottom"]
+        # a known row count means a stuck grid is only lagging: be more patient
+        patience = self.patience * 2 if s["total"] > 0 and s["last"] < s["total"] else self.patience
+        for attempt in range(patience):
+            # re-press on even attempts; odd ones only wait longer for a slow render
+            if attempt % 2 == 0:
+                if attempt == 2 and self.mode == "page":
+                    self.mode = "arrows"        # PAGE_DOWN had no effect on this table
+                self._press(s)
+            if self._wait(bottom, attempt // 2) != bottom:
+                self._check_contiguous(s)
+                return True
+            self.stagnant += 1
+            self._count("stagnant")
+        return False
+
+    def _check_contiguous(self, prev):
+        ns = self.state()
+        if prev["bottom"] in ns["keys"]: return
+        if prev["last"] and ns["first"] and ns["first"] <= prev["last"] + 1: return
+        # jumped past unseen rows: step back one page and continue with arrow steps
+        self._count("scroll_gap")
+        self.mode = "arrows"
+        self._press(ns, Keys.ARROW_UP, max(1, len(ns["keys"]) - 1), row=0)
+        self._wait(ns["bottom"], 0)
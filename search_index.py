@@ -0,0 +1,153 @@
+"""Local full-text index over scraped judgments (SQLite FTS5).
+
+    python search_index.py ingest Data/*.json Data/*.jsonl
+    python search_index.py search "مدني كلي 2019 تأمين"
+
+Scraper output (`row_data` + `detail_text`, JSON or JSONL) is loaded
+once. Text is folded with `textnorm.fold`: digits are mapped, bidi
+marks, tatweel and harakat are stripped, and letter variants are
+unified. Queries are folded the same way, so lookups never touch the
+browser. Rows are de-duplicated by their grid row id.
+"""
+from __future__ import annotations
+import argparse, json, re, sqlite3, time
+from pathlib import Path
+
+from sink import iter_records
+from textnorm import fold, fold_map
+
+DB_PATH = Path("Data") / "judgments_fts.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judgments (
+    id INTEGER PRIMARY KEY,
+    rid TEXT UNIQUE NOT NULL,
+    case_no TEXT, court TEXT, filed TEXT, judged TEXT, doc_id TEXT,
+    row_json TEXT NOT NULL, detail_text TEXT, source TEXT);
+CREATE VIRTUAL TABLE IF NOT EXISTS judgments_fts USING fts5(
+    case_no, body, tokenize = 'unicode61 remove_diacritics 2');
+"""
+
+
+def connect(db_path=DB_PATH) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(db_path), check_same_thread=False)
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _cell(row, i):
+    return row[i] if i < len(row) else ""
+
+
+def ingest(paths, db_path=DB_PATH) -> int:
+    """Add every new judgment in `paths`; returns how many were added."""
+    db, added = connect(db_path), 0
+    with db:
+        for path in map(Path, paths):
+            for rec in iter_records(path):
+                row = rec.get("row_data") or []
+                rid = "|".join(row)
+                if not rid: continue
+                cur = db.execute(
+                    "INSERT OR IGNORE INTO judgments"
+                    " (rid, case_no, court, filed, judged, doc_id, row_json, detail_text, source)"
+                    " VALUES (?,?,?,?,?,?,?,?,?)",
+                    (rid, _cell(row, 1), _cell(row, 2), _cell(row, 3), _cell(row, 4), _cell(row, 5),
+                     json.dumps(row, ensure_ascii=False), rec.get("detail_text", ""), path.name))
+                if not cur.rowcount: continue
+                db.execute("INSERT INTO judgments_fts (rowid, case_no, body) VALUES (?,?,?)",
+                           (cur.lastrowid, fold(_cell(row, 1)), fold(rec.get("detail_text", ""))))
+                added += 1
+    db.close()
+    return added
+
+
+def fts_query(q: str) -> str:
+    """Folded terms as quoted FTS5 strings (AND-ed); a trailing * keeps prefix search."""
+    terms = []
+    for t in fold(q).split():
+        star = t.endswith("*")
+        t = t.rstrip("*").replace('"', '""')
+        if t: terms.append(f'"{t}"' + ("*" if star else ""))
+    return " ".join(terms)
+
+
+_MARK = re.compile("\x01(.*?)\x02", re.S)
+
+
+def raw_snippet(raw: str, marked: str, width=160) -> str | None:
+    """Snippet of the original text around the matches FTS marked (\\x01…\\x02)
+    in its folded copy; None if the folded copy does not line up with `raw`."""
+    folded, idx = fold_map(raw)
+    spans, plain, pos = [], [], 0
+    for m in _MARK.finditer(marked):
+        plain.append(marked[pos:m.start()])
+        start = sum(map(len, plain))
+        plain.append(m[1]); pos = m.end()
+        if m[1]: spans.append((idx[start], idx[start + len(m[1]) - 1] + 1))
+    plain.append(marked[pos:])
+    if "".join(plain) != folded or not spans: return None
+    lo = max(0, spans[0][0] - width // 2)
+    hi = min(len(raw), lo + width)
+    while lo > 0 and not raw[lo - 1].isspace(): lo -= 1       # whole words at both ends
+    while hi < len(raw) and not raw[hi].isspace(): hi += 1
+    out, at = [], lo
+    for a, b in spans:
+        if a < at or b > hi: continue
+        out += [raw[at:a], "«", raw[a:b], "»"]; at = b
+    out.append(raw[at:hi])
+    text = " ".join("".join(out).split())
+    return ("…" if lo > 0 else "") + text + ("…" if hi < len(raw) else "")
+
+
+def search(q: str, limit=50, db_path=DB_PATH) -> list[dict]:
+    match = fts_query(q)
+    if not match: return []
+    db = connect(db_path)
+    try:
+        rows = db.execute(
+            "SELECT j.id, j.case_no, j.court, j.filed, j.judged, j.doc_id,"
+            "       snippet(judgments_fts, 1, '«', '»', '…', 16),"
+            "       highlight(judgments_fts, 1, char(1), char(2)), j.detail_text"
+            " FROM judgments_fts JOIN judgments j ON j.id = judgments_fts.rowid"
+            " WHERE judgments_fts MATCH ? ORDER BY rank LIMIT ?", (match, limit)).fetchall()
+    finally:
+        db.close()
+    keys = ("id", "case_no", "court", "filed", "judged", "doc_id", "snippet")
+    # show the snippet on the original text; the folded one only as a fallback
+    return [dict(zip(keys, (*r[:6], raw_snippet(r[8] or "", r[7] or "") or r[6]))) for r in rows]
+
+
+def get_detail(jid: int, db_path=DB_PATH) -> str | None:
+    """Judgment text by `search()` hit id (a case number repeats across courts)."""
+    db = connect(db_path)
+    try:
+        r = db.execute("SELECT detail_text FROM judgments WHERE id=?", (jid,)).fetchone()
+    finally:
+        db.close()
+    return r[0] if r else None
+
+
+def data_files(data_dir="Data"):
+    """Scraper outputs in `data_dir` (both layouts)."""
+    d = Path(data_dir)
+    return sorted(list(d.glob("*.json")) + list(d.glob("*.jsonl")))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("ingest").add_argument("paths", nargs="*")
+    s = sub.add_parser("search"); s.add_argument("query"); s.add_argument("--limit", type=int, default=20)
+    a = ap.parse_args()
+    if a.cmd == "ingest":
+        t0 = time.time()
+        n = ingest(a.paths or data_files())
+        print(f"✓ {n} new judgments indexed in {time.time() - t0:.1f}s")
+    else:
+        t0 = time.perf_counter()
+        hits = search(a.query, a.limit)
+        for h in hits:
+            print(f"{h['case_no']} | {h['court']} | {h['judged']}\n    {h['snippet']}")
+        print(f"{len(hits)} hits in {(time.perf_counter() - t0) * 1e3:.1f} ms")
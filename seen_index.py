@@ -0,0 +1,95 @@
+"""Durable index of already-scraped grid rows, scoped per search.
+
+Rows are keyed by the same `"|".join(cells)` id the scrapers use for
+de-duplication, and grouped under a scope built from the search filters
+(court, classification, type, year). A restarted crawl skips the detail
+click for every row already recorded under its scope.
+"""
+from __future__ import annotations
+import hashlib, sqlite3, time
+from pathlib import Path
+
+DB_PATH = Path("Data") / "seen.sqlite"
+
+
+def scope_key(*parts) -> str:
+    """Stable scope string for a filter combination (empty parts allowed)."""
+    return "|".join("" if p is None else str(p).strip() for p in parts)
+
+
+def scope_id(scope: str) -> str:
+    """Short filesystem-safe id for a scope."""
+    return hashlib.sha1(scope.encode("utf-8")).hexdigest()[:10]
+
+
+class SeenIndex:
+    """SQLite-backed set of row ids. `add` is buffered in memory and written
+    in one short transaction by `commit`, so parallel workers sharing the
+    database never hold its write lock between commits."""
+
+    def __init__(self, scope: str, db_path=DB_PATH):
+        self.scope = scope
+        self._pending: set[str] = set()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " scope TEXT NOT NULL, rid TEXT NOT NULL, ts REAL NOT NULL,"
+            " PRIMARY KEY (scope, rid)) WITHOUT ROWID")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hwm ("
+            " scope TEXT PRIMARY KEY, mark TEXT NOT NULL, ts REAL NOT NULL)")
+        self.db.commit()
+
+    def __contains__(self, rid) -> bool:
+        if rid in self._pending: return True
+        return self.db.execute(
+            "SELECT 1 FROM seen WHERE scope=? AND rid=?", (self.scope, rid)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        self.commit()                       # pending ids may already be stored: count distinct rows
+        return self.db.execute("SELECT COUNT(*) FROM seen WHERE scope=?", (self.scope,)).fetchone()[0]
+
+    def add(self, rid):
+        self._pending.add(rid)
+
+    def update(self, rids):
+        now = time.time()
+        self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?,?,?)",
+                            ((self.scope, r, now) for r in rids))
+        self.db.commit()
+
+    def commit(self):
+        if self._pending:
+            now = time.time()
+            with self.db:
+                self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?,?,?)",
+                                    ((self.scope, r, now) for r in self._pending))
+            self._pending.clear()
+        self.db.commit()
+
+    # ── incremental refresh: newest judgment date fully covered ──
+    def high_water(self) -> str | None:
+        """ISO date (YYYY-MM-DD) up to which this scope is complete, or None."""
+        r = self.db.execute("SELECT mark FROM hwm WHERE scope=?", (self.scope,)).fetchone()
+        return r[0] if r else None
+
+    def set_high_water(self, mark: str):
+        """Raise the mark (never lowers it)."""
+        old = self.high_water()
+        if old and old >= mark: return
+        self.db.execute("INSERT OR REPLACE INTO hwm VALUES (?,?,?)", (self.scope, mark, time.time()))
+        self.db.commit()
+
+    def clear(self):
+        self._pending.clear()
+        self.db.execute("DELETE FROM seen WHERE scope=?", (self.scope,))
+        self.db.execute("DELETE FROM hwm WHERE scope=?", (self.scope,))
+        self.db.commit()
+
+    def close(self):
+        self.commit()
+        self.db.close()
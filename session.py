@@ -0,0 +1,154 @@
+"""Reusable portal sessions: Chrome profile, cookie jar and a warm daemon.
+
+* `PROFILE_DIR`: a Chrome user-data dir kept under `Data/`, so the
+  login / CAPTCHA state of main.py survives between runs.
+* `CookieJar`: the portal cookies of the last good session
+  (`Data/cookies.json`). They are injected over CDP before the first
+  page load and are ignored once older than `RAK_SESSION_TTL` seconds
+  (default 8 h) or past their own expiry.
+* `python session.py daemon`: a long-lived Chrome that opens the portal,
+  waits on the search form and keeps refreshing the cookie jar. Jobs
+  attach to it with `RAK_DEBUGGER=127.0.0.1:9222` instead of launching
+  Chrome. One job at a time per daemon; run one daemon per port for
+  parallel jobs.
+"""
+from __future__ import annotations
+import argparse, json, os, re, time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+DATA_DIR = Path("Data")
+PROFILE_DIR = DATA_DIR / "chrome_profile"
+COOKIE_PATH = DATA_DIR / "cookies.json"
+SESSION_TTL = float(os.environ.get("RAK_SESSION_TTL", 8 * 3600))
+FORM_CSS = 'input[data-hint*="ZDE_COURT_TYPE"]'
+PORTAL_URL = "https://grpportal.rak.ae/irj/portal/judgement_publications"
+
+
+def profile_dir(label="") -> Path:
+    """Per-label profile (Chrome allows one browser per user-data dir)."""
+    label = re.sub(r"[^\w.-]+", "_", label).strip("._")
+    d = PROFILE_DIR.with_name(f"{PROFILE_DIR.name}_{label}") if label else PROFILE_DIR
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+class CookieJar:
+    def __init__(self, path=COOKIE_PATH, ttl=SESSION_TTL):
+        self.path, self.ttl = Path(path), ttl
+
+    def save(self, driver):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"saved": time.time(), "cookies": driver.get_cookies()}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def cookies(self) -> list[dict]:
+        """Still-valid cookies, or [] when the jar is missing or stale."""
+        try: data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError): return []
+        now = time.time()
+        if now - data.get("saved", 0) > self.ttl: return []
+        return [c for c in data.get("cookies", []) if not c.get("expiry") or c["expiry"] > now]
+
+    def load(self, driver) -> int:
+        """Inject the jar before the first navigation; returns how many cookies were set."""
+        cookies = self.cookies()
+        if not cookies: return 0
+        params = [{k: v for k, v in (("name", c["name"]), ("value", c["value"]),
+                                     ("domain", c.get("domain")), ("path", c.get("path", "/")),
+                                     ("secure", c.get("secure", False)), ("httpOnly", c.get("httpOnly", False)),
+                                     ("sameSite", c.get("sameSite")), ("expires", c.get("expiry")))
+                   if v is not None} for c in cookies]
+        try: driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+        except Exception: return 0
+        return len(params)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+def on_form(driver, css=FORM_CSS, timeout=0.0) -> bool:
+    """Is the (current frame of the) browser sitting on the search form?
+    False on a login / CAPTCHA page."""
+    deadline = time.time() + timeout
+    while True:
+        if driver.find_elements(By.CSS_SELECTOR, css): return True
+        if time.time() >= deadline: return False
+        time.sleep(0.25)
+
+
+def attach(address, url=PORTAL_URL, perf_log=False):
+    """WebDriver on an already running Chrome (`host:port` of its debugger).
+
+    Selects the tab that is on the portal. `quit()` only stops this
+    chromedriver, so the daemon's browser and its warm tab survive the job.
+    """
+    opts = webdriver.ChromeOptions()
+    opts.add_experimental_option("debuggerAddress", address)
+    if perf_log:
+        from detail_fetch import enable_network_log
+        enable_network_log(opts)
+    drv = webdriver.Chrome(options=opts)
+    host = urlparse(url).netloc
+    for h in drv.window_handles:
+        drv.switch_to.window(h)
+        if host and host in drv.current_url: break
+    drv.quit = drv.service.stop
+    drv.rak_attached = True
+    return drv
+
+
+def attach_address():
+    return os.environ.get("RAK_DEBUGGER") or None
+
+
+# ── daemon ─────────────────────────────────────────────────────
+def daemon(port=9222, url=PORTAL_URL, headless=False, keepalive=60, form_css=FORM_CSS):
+    opts = webdriver.ChromeOptions()
+    if headless: opts.add_argument("--headless=new")
+    opts.add_argument(f"--remote-debugging-port={port}")
+    opts.add_argument(f"--user-data-dir={profile_dir(f'daemon{port}').resolve()}")
+    opts.add_argument("--window-size=1920,1080")
+    drv = webdriver.Chrome(options=opts)
+    jar = CookieJar()
+    jar.load(drv)
+    drv.get(url)
+    print(f"🌐 daemon on 127.0.0.1:{port} – {url}")
+    # the form may sit in nested iframes (portal) or at the top (Web Dynpro app)
+    from frames import FrameLocator
+    frames = FrameLocator(DATA_DIR / "frame_paths.json")
+    while not frames.enter(drv, "form", (By.CSS_SELECTOR, form_css)):
+        print("… waiting for the search form (solve the login / CAPTCHA in the window)")
+        time.sleep(5)
+    drv.switch_to.default_content()
+    jar.save(drv)
+    print(f"✓ warm on the search form; jobs can set RAK_DEBUGGER=127.0.0.1:{port}")
+    try:
+        while True:
+            time.sleep(keepalive)
+            try: jar.save(drv)          # read-only: never touches the page a job may be using
+            except Exception as e: print(f"⚠ keepalive: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        drv.quit()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    d = sub.add_parser("daemon")
+    d.add_argument("--port", type=int, default=9222)
+    d.add_argument("--url", default=os.environ.get("RAK_URL", PORTAL_URL))
+    d.add_argument("--headless", action="store_true")
+    d.add_argument("--keepalive", type=float, default=60)
+    sub.add_parser("forget", help="drop the saved cookie jar")
+    a = ap.parse_args()
+    if a.cmd == "daemon":
+        daemon(a.port, a.url, a.headless, a.keepalive)
+    else:
+        CookieJar().clear(); print("✓ cookie jar cleared")
@@ -0,0 +1,106 @@
+"""Append-only JSONL output for the scrapers.
+
+Each judgment is written as one line the moment it is scraped, so saving
+row N no longer re-serialises rows 0..N-1. `export_json` turns the JSONL
+file into the pretty-printed list layout used in `Data/*.json`.
+"""
+from __future__ import annotations
+import json, os, textwrap
+from pathlib import Path
+
+
+class JsonlSink:
+    """Buffered JSONL writer that flushes + fsyncs every `sync_every` rows.
+
+    `on_flush` runs after each fsync, so state that must never get ahead
+    of the file on disk (e.g. the seen-row index) can commit in step.
+    """
+
+    def __init__(self, path, sync_every=25, resume=False, on_flush=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            _drop_partial_line(self.path)
+            self.count = sum(1 for _ in iter_jsonl(self.path))
+        else:
+            self.path.write_text("", encoding="utf-8")
+            self.count = 0
+        self.sync_every = max(1, sync_every)
+        self.on_flush = on_flush
+        self._pending = 0
+        self._fh = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+
+    def append(self, row_data, detail_text) -> int:
+        """Write one judgment; returns its `index`."""
+        idx = self.count
+        rec = {"index": idx, "row_data": row_data, "detail_text": detail_text}
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.flush()
+        return idx
+
+    def flush(self):
+        if self._fh.closed: return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._pending = 0
+        if self.on_flush: self.on_flush()
+
+    def close(self):
+        if self._fh.closed: return
+        self.flush()
+        self._fh.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+def _drop_partial_line(path: Path):
+    """Cut a half-written trailing record left behind by a crash."""
+    with open(path, "rb+") as fh:
+        data = fh.read()
+        if data and not data.endswith(b"\n"):
+            fh.truncate(data.rfind(b"\n") + 1)
+
+
+def row_ids(path):
+    """Row ids (`"|".join(row_data)`) of every record in a JSONL file."""
+    return ("|".join(r.get("row_data") or []) for r in iter_jsonl(path))
+
+
+def iter_jsonl(path):
+    """Yield the records of a JSONL file, skipping blank or corrupt lines."""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line: continue
+            try: yield json.loads(line)
+            except json.JSONDecodeError: continue
+
+
+def export_json(jsonl_path, json_path) -> int:
+    """Stream a JSONL file into the `json.dumps(results, indent=2)` layout."""
+    n = 0
+    with open(json_path, "w", encoding="utf-8") as out:
+        for rec in iter_jsonl(jsonl_path):
+            out.write("[\n" if n == 0 else ",\n")
+            out.write(textwrap.indent(json.dumps(rec, ensure_ascii=False, indent=2), "  "))
+            n += 1
+        out.write("\n]" if n else "[]")
+    return n
+
+
+def iter_records(path):
+    """Judgment records (`row_data` + `detail_text`) of one JSON or JSONL
+    output; other JSON files in Data/ yield nothing."""
+    path = Path(path)
+    if path.suffix == ".jsonl":
+        recs = iter_jsonl(path)
+    else:
+        try: recs = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError: return
+        if not isinstance(recs, list): return
+    for rec in recs:
+        if isinstance(rec, dict) and "row_data" in rec: yield rec
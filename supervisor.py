@@ -0,0 +1,173 @@
+"""Keeps long crawls alive: hang watchdog and Chrome recycling.
+
+`run_scraper` drives one Chrome per *session*. A `Supervisor` ends a
+session by raising `Recycle`, and `run_scraper` then starts a fresh
+browser, restores the filters and resumes through the seen index (rows
+already saved are skipped without a click). A session ends when:
+
+* the worker has not reported progress (`beat`) for `hang_timeout`
+  seconds. The watchdog thread kills chromedriver and its Chrome
+  children, so the hung WebDriver call fails instead of blocking forever.
+  Without psutil the children are found through chromedriver's own
+  process group (`browser_service`) or `taskkill /T` on Windows;
+* `every` rows were scraped, or Chrome's RSS exceeds `max_rss_mb`
+  (read with `psutil`, or from `/proc` on Linux);
+* the browser stopped answering, or the grid vanished or could not be
+  scrolled.
+"""
+from __future__ import annotations
+import os, signal, subprocess, threading, time
+
+from selenium.webdriver.chrome.service import Service
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class Recycle(Exception):
+    """Raised to end the current browser session; the crawl goes on in a new one."""
+
+
+def browser_service() -> Service:
+    """chromedriver Service in its own session/process group, so `kill_browser`
+    can take Chrome down with it even without psutil."""
+    return Service(popen_kw={"start_new_session": True}) if os.name == "posix" else Service()
+
+
+def _procs(driver):
+    proc = getattr(getattr(driver, "service", None), "process", None)
+    if proc is None or not psutil: return proc, []
+    try: return proc, psutil.Process(proc.pid).children(recursive=True)
+    except psutil.Error: return proc, []
+
+
+def _proc_tree(pid) -> list[int]:
+    """`pid` and its descendants from /proc (Linux, no psutil)."""
+    parent = {}
+    for d in os.listdir("/proc"):
+        if not d.isdigit(): continue
+        try:
+            with open(f"/proc/{d}/stat", "rb") as f: stat = f.read()
+        except OSError: continue
+        parent.setdefault(int(stat.rsplit(b")", 1)[1].split()[1]), []).append(int(d))
+    tree, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        tree.append(p)
+        todo.extend(parent.get(p, ()))
+    return tree
+
+
+def _proc_rss(pid) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"): return int(line.split()[1]) * 1024
+    except (OSError, ValueError): pass
+    return 0
+
+
+def chrome_rss(driver) -> int | None:
+    """Bytes resident in chromedriver and its Chrome processes; None when unknown."""
+    proc, kids = _procs(driver)
+    if proc is None: return None
+    if psutil:
+        total = 0
+        for pid in [proc.pid, *(k.pid for k in kids)]:
+            try: total += psutil.Process(pid).memory_info().rss
+            except psutil.Error: pass
+        return total
+    if not os.path.isdir("/proc"): return None
+    return sum(map(_proc_rss, _proc_tree(proc.pid)))
+
+
+def kill_browser(driver):
+    """Hard-stop chromedriver and every Chrome process it started (any thread)."""
+    proc, kids = _procs(driver)
+    if proc is None or proc.poll() is not None: return
+    if psutil:
+        for p in kids:
+            try: p.kill()
+            except psutil.Error: pass
+    elif os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+    else:
+        try:
+            if os.getpgid(proc.pid) == proc.pid:    # started via browser_service()
+                os.killpg(proc.pid, signal.SIGKILL); return
+        except OSError: pass
+    if proc.poll() is None: proc.kill()
+
+
+def alive(driver) -> bool:
+    try: return driver.execute_script("return 1") == 1
+    except Exception: return False
+
+
+class Supervisor:
+    def __init__(self, every=2000, max_rss_mb=None, hang_timeout=180, max_restarts=5, rss_every=25):
+        self.every, self.max_rss_mb = every, max_rss_mb
+        self.hang_timeout, self.max_restarts, self.rss_every = hang_timeout, max_restarts, rss_every
+        self.restarts = self.failures = 0
+        self.rows = 0                       # rows in the current session
+        self._rss_at = 0                    # self.rows at the last RSS reading
+        self.hung = False
+        self._driver = None
+        self._beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        if max_rss_mb and not psutil and not os.path.isdir("/proc"):
+            print("⚠️  max_rss_mb needs psutil here – recycling by row count only")
+        if hang_timeout: threading.Thread(target=self._watch, daemon=True).start()
+
+    # ── session lifecycle ──
+    def attach(self, driver):
+        with self._lock:
+            self._driver, self.rows, self._rss_at, self.hung = driver, 0, 0, False
+            self._beat = time.monotonic()
+
+    def detach(self):
+        with self._lock: self._driver = None
+
+    def restart(self, reason, progressed) -> bool:
+        """Book a restart; False once `max_restarts` sessions in a row made no progress."""
+        self.restarts += 1
+        self.failures = 0 if progressed else self.failures + 1
+        print(f"♻️  Restarting Chrome ({reason}) – restart #{self.restarts}")
+        return self.failures < self.max_restarts
+
+    # ── called by the worker ──
+    def beat(self):
+        self._beat = time.monotonic()
+
+    def row_done(self):
+        self.rows += 1
+        self.beat()
+
+    def check(self, driver):
+        """Raise `Recycle` when this session is due to be replaced (call between rows/pages)."""
+        if self.hung: raise Recycle(f"no progress for {self.hang_timeout:.0f}s")
+        if self.every and self.rows >= self.every: raise Recycle(f"{self.rows} rows")
+        if self.max_rss_mb and self.rows - self._rss_at >= self.rss_every:
+            self._rss_at = self.rows
+            rss = chrome_rss(driver)
+            if rss and rss > self.max_rss_mb * 2**20: raise Recycle(f"RSS {rss / 2**20:.0f} MiB")
+
+    def on_error(self, driver):
+        """After a failed row: raise `Recycle` if the browser itself is gone."""
+        if self.hung or not alive(driver): raise Recycle("browser lost")
+
+    # ── watchdog ──
+    def _watch(self):
+        while not self._stop.wait(min(5.0, self.hang_timeout / 4)):
+            with self._lock:
+                drv = self._driver
+                if drv is None or time.monotonic() - self._beat < self.hang_timeout: continue
+                self.hung, self._driver = True, None
+            print(f"⏱  No progress for {self.hang_timeout:.0f}s – killing Chrome")
+            kill_browser(drv)
+
+    def close(self):
+        self._stop.set()
@@ -0,0 +1,42 @@
+"""Arabic text normalisation shared by the scrapers and the search index."""
+from __future__ import annotations
+import re
+
+DIGIT_MAP = str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789")
+
+def normalize(txt: str) -> str:
+    txt = txt.replace("\u200e","").replace("\u200f","").translate(DIGIT_MAP)
+    txt = re.sub(r"\s+", " ", txt).strip()
+    parts = txt.split()
+    if len(parts) > 1 and all(len(p) == 1 for p in parts):
+        txt = "".join(parts)
+    return txt
+
+# ── search folding ─────────────────────────────────────────────
+# bidi controls beyond LRM/RLM, tatweel and harakat are dropped; letter
+# variants that users type interchangeably fold to one form
+_STRIP = re.compile("[\u061c\u0640\u064b-\u065f\u0670\u202a-\u202e\u2066-\u2069]")
+_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+                       "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+                       "۰": "0", "۱": "1", "۲": "2", "۳": "3", "۴": "4",
+                       "۵": "5", "۶": "6", "۷": "7", "۸": "8", "۹": "9"})
+
+def fold(txt: str) -> str:
+    """`normalize` plus Arabic-insensitive folding, for indexing and queries."""
+    return normalize(_STRIP.sub("", txt or "").translate(_FOLD)).lower()
+
+def fold_map(txt: str) -> tuple[str, list[int]]:
+    """`fold(txt)` built character by character, plus for every folded
+    character its index in `txt`, so matches in folded text can be shown
+    on the original. (The single-letter join of `normalize` is not applied.)"""
+    out, idx, space = [], [], True
+    for i, ch in enumerate(txt or ""):
+        if ch in "\u200e\u200f" or _STRIP.match(ch): continue
+        if ch.isspace():
+            if space: continue
+            ch, space = " ", True
+        else:
+            ch, space = ch.translate(_FOLD).translate(DIGIT_MAP).lower(), False
+        out.append(ch); idx.extend([i] * len(ch))
+    if out and out[-1] == " ": out.pop(); idx.pop()
+    return "".join(out), idx
@@ -0,0 +1,93 @@
+"""Per-phase timing for the scrapers.
+
+    tr = Tracer("Data/trace.jsonl")
+    with tr.span("detail", row=rid): ...
+    tr.count("stagnant")
+    print(tr.summary())
+
+Each span is one JSONL line (`phase`, `t`, `ms`, `ok`, extra fields).
+Durations and counters are also kept in memory for the end-of-run
+summary (rows/min, p50/p95 per phase) and for `prometheus()`, which
+renders them in the Prometheus text format. Without a path nothing is
+written to disk. Safe to share between threads.
+"""
+from __future__ import annotations
+import json, threading, time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _pct(sorted_vals, p):
+    if not sorted_vals: return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(p * len(sorted_vals)))]
+
+
+class Tracer:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        if self.path: self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8", buffering=1) if self.path else None
+        self._mx = threading.Lock()
+        self.t0 = time.time()
+        self.spans: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def span(self, phase, **fields):
+        t = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(phase, time.perf_counter() - t, ok, **fields)
+
+    def record(self, phase, seconds, ok=True, **fields):
+        with self._mx:
+            self.spans.setdefault(phase, []).append(seconds)
+            if not ok: self.counters[f"{phase}_errors"] = self.counters.get(f"{phase}_errors", 0) + 1
+            if self._fh:
+                rec = {"phase": phase, "t": round(time.time(), 3), "ms": round(seconds * 1e3, 2), "ok": ok, **fields}
+                self._fh.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+
+    def count(self, name, n=1):
+        with self._mx:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self, rows=None) -> str:
+        """Run report; `rows` defaults to the "rows" counter."""
+        with self._mx:
+            spans = {k: sorted(v) for k, v in self.spans.items()}
+            counters = dict(self.counters)
+        rows = counters.get("rows", 0) if rows is None else rows
+        mins = max(time.time() - self.t0, 1e-6) / 60
+        out = [f"⏱  {rows} rows in {mins:.1f} min ({rows / mins:.1f} rows/min)",
+               f"   {'phase':<16}{'n':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}"]
+        for k, v in sorted(spans.items(), key=lambda kv: -sum(kv[1])):
+            out.append(f"   {k:<16}{len(v):>7}{sum(v):>10.1f}{_pct(v, .5) * 1e3:>10.0f}{_pct(v, .95) * 1e3:>10.0f}")
+        if counters:
+            out.append("   " + ", ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+        return "\n".join(out)
+
+    def prometheus(self, prefix="rak_scrape") -> str:
+        with self._mx:
+            spans = {k: list(v) for k, v in self.spans.items()}
+            counters = dict(self.counters)
+        out = [f"# TYPE {prefix}_phase_seconds summary"]
+        for k, v in sorted(spans.items()):
+            s = sorted(v)
+            for q in (.5, .95):
+                out.append(f'{prefix}_phase_seconds{{phase="{k}",quantile="{q}"}} {_pct(s, q):.6f}')
+            out.append(f'{prefix}_phase_seconds_sum{{phase="{k}"}} {sum(s):.6f}')
+            out.append(f'{prefix}_phase_seconds_count{{phase="{k}"}} {len(s)}')
+        for k, v in sorted(counters.items()):
+            out += [f"# TYPE {prefix}_{k}_total counter", f"{prefix}_{k}_total {v}"]
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path, prefix="rak_scrape"):
+        Path(path).write_text(self.prometheus(prefix), encoding="utf-8")
+
+    def close(self):
+        if self._fh: self._fh.close(); self._fh = None
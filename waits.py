@@ -0,0 +1,83 @@
+"""Event-driven waits built on a MutationObserver.
+
+Each wait evaluates its condition once, then re-evaluates it only when
+the DOM of the current frame actually changes, and returns as soon as it
+holds. The timeout is only reached when nothing happens, which replaces
+the fixed `time.sleep` calls and 0.25 s polling loops in the scrapers.
+"""
+from __future__ import annotations
+
+from selenium.common.exceptions import JavascriptException
+
+BUSY_CSS = 'div[id^="urBusyIndicator"]'
+LISTBOX_CSS = "div.lsListbox__value[role='option'], div[ct='LIB_I']"
+
+_OBSERVE_JS = """
+const args = arguments, done = args[args.length - 1];
+const vis = e => !!e && e.getClientRects().length > 0 && getComputedStyle(e).visibility !== "hidden";
+const check = () => { try { return (%s); } catch (e) { return null; } };
+let v = check();
+if (v) return done(v);
+const root = (args[0] && document.querySelector(args[0])) || document.documentElement;
+let timer;
+const obs = new MutationObserver(() => {
+  const v = check();
+  if (v) { obs.disconnect(); clearTimeout(timer); done(v); }
+});
+obs.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(() => { obs.disconnect(); done(check() || null); }, args[1]);
+"""
+
+_QUIET_JS = """
+const [quiet, limit] = arguments, done = arguments[arguments.length - 1];
+let seen = false, t;
+const fin = () => { obs.disconnect(); clearTimeout(t); clearTimeout(hard); done(seen); };
+const obs = new MutationObserver(() => { seen = true; clearTimeout(t); t = setTimeout(fin, quiet); });
+obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+const hard = setTimeout(fin, limit);
+"""
+
+
+def _script_timeout(driver, secs):
+    # one extra round trip only when a longer wait than before is requested
+    cur = getattr(driver, "_rak_script_timeout", 0)
+    if secs > cur:
+        driver.set_script_timeout(secs)
+        driver._rak_script_timeout = secs
+
+
+def wait_for(driver, cond_js, *args, timeout=4, watch_css=None):
+    """Wait until the JS expression `cond_js` is truthy; returns its value or None.
+
+    `cond_js` may use `args[2]`, `args[3]`, ... for the extra `args` and the
+    `vis(el)` helper. Only mutations under `watch_css` (default: whole
+    document) trigger a re-check.
+    """
+    _script_timeout(driver, timeout + 5)
+    try:
+        return driver.execute_async_script(_OBSERVE_JS % cond_js, watch_css,
+                                           int(timeout * 1000), *args)
+    except JavascriptException:
+        return None         # document unloaded mid-wait (navigation); caller re-checks
+
+
+def wait_idle(driver, timeout=20, busy_css=BUSY_CSS) -> bool:
+    """Wait until no busy indicator is visible."""
+    cond = "!Array.from(document.querySelectorAll(args[2])).some(vis)"
+    return bool(wait_for(driver, cond, busy_css, timeout=timeout))
+
+
+def wait_listbox(driver, timeout=5, css=LISTBOX_CSS) -> bool:
+    """Wait until a dropdown list has rendered at least one visible option."""
+    cond = "Array.from(document.querySelectorAll(args[2])).some(vis)"
+    return bool(wait_for(driver, cond, css, timeout=timeout))
+
+
+def wait_quiet(driver, quiet=0.15, timeout=1.0) -> bool:
+    """Return once the DOM has been still for `quiet` s after a change (or at
+    `timeout`); True if anything changed."""
+    _script_timeout(driver, timeout + 5)
+    try:
+        return bool(driver.execute_async_script(_QUIET_JS, int(quiet * 1000), int(timeout * 1000)))
+    except JavascriptException:
+        return True